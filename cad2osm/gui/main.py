@@ -16,7 +16,7 @@ sys.path.append(str(project_root))
 
 # 导入PyQt5
 from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import QTranslator, QLocale
+from PyQt5.QtCore import QTranslator, QLocale, QSettings, QThread, QThreadPool
 
 # 导入主窗口
 from ui.main_window import MainWindow
@@ -24,6 +24,9 @@ from ui.main_window import MainWindow
 # 导入语言管理器
 from utils.language_manager import language_manager
 
+# 全局线程池为界面线程、配置写入和处理线程保留的线程数
+RESERVED_THREAD_COUNT = 3
+
 def main():
     """应用程序入口点"""
     # 创建应用程序实例
@@ -33,6 +36,13 @@ def main():
     app.setApplicationName("CAD2OSM")
     app.setOrganizationName("AGSeg")
 
+    # 限制全局线程池的线程数，避免后台任务占满CPU导致界面卡顿；
+    # 可通过设置项thread_pool/max_threads覆盖
+    settings = QSettings()
+    default_threads = max(2, QThread.idealThreadCount() - RESERVED_THREAD_COUNT)
+    max_threads = settings.value("thread_pool/max_threads", default_threads, type=int)
+    QThreadPool.globalInstance().setMaxThreadCount(max(1, max_threads))
+
     # 初始化语言管理器（加载默认语言）
     language_manager.load_language("zh_CN")
 
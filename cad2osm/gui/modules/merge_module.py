@@ -17,7 +17,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent / 'script' / 'functions'
 
 # 导入合并模块
 try:
-    from merge_osm import merge_osm_files, find_matching_areas, calculate_offset, apply_offset, find_max_ids, update_ids, load_osm_file, save_osm_file
+    from merge_osm import merge_osm_files, find_areas_by_type, calculate_offset, apply_offset, find_max_ids, update_ids, load_osm_file, save_osm_file
 except ImportError as e:
     print(f"导入合并模块失败: {e}")
 
@@ -25,10 +25,9 @@ class MergeWorker(QThread):
     """
     合并工作线程，用于在后台执行OSM合并任务
     """
-    progress_updated = pyqtSignal(int, str)  # 进度更新信号
-    process_completed = pyqtSignal(bool, str)  # 处理完成信号
+    progress_updated = pyqtSignal(float, int, float, float, str)  # 进度更新信号（进度, 匹配区域数, 纬度偏移, 经度偏移, 状态）
+    process_completed = pyqtSignal(bool, str, int, float, float)  # 处理完成信号（是否成功, 消息, 匹配区域数, 纬度偏移, 经度偏移）
     log_message = pyqtSignal(str)  # 日志消息信号
-    stats_updated = pyqtSignal(dict)  # 统计信息更新信号
 
     def __init__(self, ref_path, target_paths, output_path, params=None):
         super().__init__()
@@ -38,6 +37,27 @@ class MergeWorker(QThread):
         self.params = params or {}
         self.is_cancelled = False
 
+        # 当前统计信息，随进度和完成信号一并发送
+        self.matched_areas = 0
+        self.lat_offset = 0.0
+        self.lon_offset = 0.0
+
+    def emit_progress(self, progress, status=""):
+        """
+        发送进度信号，附带当前统计信息
+
+        参数:
+            progress: 进度（0-1）
+            status: 状态文本，为空时界面保留原状态
+        """
+        self.progress_updated.emit(progress, self.matched_areas, self.lat_offset, self.lon_offset, status)
+
+    def emit_completed(self, success, message):
+        """
+        发送完成信号，附带最终统计信息
+        """
+        self.process_completed.emit(success, message, self.matched_areas, self.lat_offset, self.lon_offset)
+
     def run(self):
         """
         执行OSM合并任务
@@ -46,7 +66,7 @@ class MergeWorker(QThread):
             self.merge_osm_files()
         except Exception as e:
             self.log_message.emit(f"处理过程中发生错误: {str(e)}")
-            self.process_completed.emit(False, f"处理失败: {str(e)}")
+            self.emit_completed(False, f"处理失败: {str(e)}")
 
     def merge_osm_files(self):
         """
@@ -71,14 +91,14 @@ class MergeWorker(QThread):
         self.log_message.emit(f"加载参照OSM文件: {os.path.basename(self.ref_path)}")
         ref_root, ref_tree = load_osm_file(self.ref_path)
         if not ref_root:
-            self.process_completed.emit(False, "无法加载参照OSM文件")
+            self.emit_completed(False, "无法加载参照OSM文件")
             return
 
         # 查找参照文件中的最大ID
         ref_max_ids = find_max_ids(ref_root)
 
         # 更新进度
-        self.progress_updated.emit(10, "参照文件加载完成")
+        self.emit_progress(0.1, "参照文件加载完成")
 
         # 创建输出目录（如果不存在）
         os.makedirs(os.path.dirname(self.output_path), exist_ok=True)
@@ -90,12 +110,12 @@ class MergeWorker(QThread):
 
         for i, target_path in enumerate(self.target_paths):
             if self.is_cancelled:
-                self.process_completed.emit(False, "处理已取消")
+                self.emit_completed(False, "处理已取消")
                 return
 
             # 更新进度
-            progress = 10 + (i / total_files) * 80
-            self.progress_updated.emit(int(progress), f"处理目标文件 {i+1}/{total_files}")
+            progress = 0.1 + (i / total_files) * 0.8
+            self.emit_progress(progress, f"处理目标文件 {i+1}/{total_files}")
 
             # 加载目标文件
             self.log_message.emit(f"加载目标OSM文件: {os.path.basename(target_path)}")
@@ -107,25 +127,25 @@ class MergeWorker(QThread):
             # 查找匹配区域
             self.log_message.emit(f"查找匹配区域 (类型: {area_type})...")
 
-            # 查找参照文件中的区域
+            # 单次遍历查找所需类型的区域
             if area_type_param == 'both':
-                ref_elevators = find_matching_areas(ref_root, 'elevator')
-                ref_stairs = find_matching_areas(ref_root, 'stairs')
-                ref_areas = {**ref_elevators, **ref_stairs}
+                area_types = ('elevator', 'stairs')
             else:
-                ref_areas = find_matching_areas(ref_root, area_type_param)
+                area_types = (area_type_param,)
+
+            # 查找参照文件中的区域
+            ref_areas = {}
+            for areas in find_areas_by_type(ref_root, area_types).values():
+                ref_areas.update(areas)
 
             # 查找目标文件中的区域
-            if area_type_param == 'both':
-                target_elevators = find_matching_areas(target_root, 'elevator')
-                target_stairs = find_matching_areas(target_root, 'stairs')
-                target_areas = {**target_elevators, **target_stairs}
-            else:
-                target_areas = find_matching_areas(target_root, area_type_param)
+            target_areas = {}
+            for areas in find_areas_by_type(target_root, area_types).values():
+                target_areas.update(areas)
 
             # 计算偏移量
             self.log_message.emit(f"计算偏移量 (方法: {offset_method})...")
-            lat_offset, lon_offset, offset_details = calculate_offset(ref_areas, target_areas)
+            lat_offset, lon_offset, offset_details = calculate_offset(ref_areas, target_areas, return_details=True)
 
             # 检查是否有足够的匹配区域
             matched_areas = len(offset_details)
@@ -136,12 +156,10 @@ class MergeWorker(QThread):
                 continue
 
             # 更新统计信息
-            stats = {
-                'matched_areas': matched_areas_total,
-                'lat_offset': lat_offset,
-                'lon_offset': lon_offset
-            }
-            self.stats_updated.emit(stats)
+            self.matched_areas = matched_areas_total
+            self.lat_offset = float(lat_offset)
+            self.lon_offset = float(lon_offset)
+            self.emit_progress(0.1 + ((i + 0.5) / total_files) * 0.8)
 
             # 应用偏移量
             self.log_message.emit(f"应用偏移量 (纬度: {lat_offset:.8f}, 经度: {lon_offset:.8f})...")
@@ -165,19 +183,19 @@ class MergeWorker(QThread):
 
         # 保存最终结果
         if self.is_cancelled:
-            self.process_completed.emit(False, "处理已取消")
+            self.emit_completed(False, "处理已取消")
             return
 
         self.log_message.emit(f"保存合并后的OSM文件: {self.output_path}")
         success = save_osm_file(current_tree, self.output_path)
 
         # 更新进度
-        self.progress_updated.emit(100, "合并完成")
+        self.emit_progress(1.0, "合并完成")
 
         if success:
-            self.process_completed.emit(True, "OSM文件合并完成")
+            self.emit_completed(True, "OSM文件合并完成")
         else:
-            self.process_completed.emit(False, "保存合并后的OSM文件失败")
+            self.emit_completed(False, "保存合并后的OSM文件失败")
 
     def cancel(self):
         """
@@ -191,18 +209,16 @@ class MergeModule(QObject):
     OSM合并模块，负责协调GUI和处理逻辑
     """
     # 定义信号
-    progress_updated = pyqtSignal(int, str)  # 进度更新信号
-    process_completed = pyqtSignal(bool, str)  # 处理完成信号
+    progress_updated = pyqtSignal(float, int, float, float, str)  # 进度更新信号（进度, 匹配区域数, 纬度偏移, 经度偏移, 状态）
+    process_completed = pyqtSignal(bool, str, int, float, float)  # 处理完成信号（是否成功, 消息, 匹配区域数, 纬度偏移, 经度偏移）
     log_message = pyqtSignal(str)  # 日志消息信号
-    stats_updated = pyqtSignal(dict)  # 统计信息更新信号
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.worker = None
 
     def start_merging(self, ref_path, target_files, output_path, area_type='两者',
-                     offset_method='顶点平均', min_matches=2,
-                     progress_callback=None, completion_callback=None):
+                     offset_method='顶点平均', min_matches=2):
         """
         启动OSM合并流程
 
@@ -213,8 +229,8 @@ class MergeModule(QObject):
             area_type: 匹配区域类型
             offset_method: 偏移计算方法
             min_matches: 最小匹配区域数量
-            progress_callback: 进度回调函数
-            completion_callback: 完成回调函数
+
+        进度和结果通过 progress_updated / process_completed 信号通知界面
         """
         params = {
             'area_type': area_type,
@@ -235,7 +251,6 @@ class MergeModule(QObject):
             self.worker.progress_updated.connect(self.progress_updated)
             self.worker.process_completed.connect(self.process_completed)
             self.worker.log_message.connect(self.log_message)
-            self.worker.stats_updated.connect(self.stats_updated)
 
     def cancel_merging(self):
         """
@@ -23,6 +23,21 @@ try:
 except ImportError as e:
     print(f"导入核心处理模块失败: {e}")
 
+def ensure_dir(path):
+    """
+    确保目录存在
+
+    目录通常已经存在，先尝试一次mkdir，只有父目录缺失时才逐级创建。
+    """
+    try:
+        os.mkdir(path)
+    except FileExistsError:
+        # 同名的是普通文件时与os.makedirs保持一致，抛出异常
+        if not os.path.isdir(path):
+            raise
+    except FileNotFoundError:
+        os.makedirs(path, exist_ok=True)
+
 class ProcessWorker(QThread):
     """
     处理工作线程，用于在后台执行CAD预处理任务
@@ -46,6 +61,9 @@ class ProcessWorker(QThread):
         执行处理任务
         """
         try:
+            # 在工作线程中创建输出目录，避免慢速文件系统阻塞界面
+            ensure_dir(self.output_dir)
+
             if self.mode == 'full':
                 self.run_full_process()
             elif self.mode == 'semi':
@@ -389,10 +407,13 @@ class ProcessModule(QObject):
     step_progress_updated = pyqtSignal(int, str)  # 步骤进度更新信号
     process_completed = pyqtSignal(bool, str)  # 处理完成信号
     log_message = pyqtSignal(str)  # 日志消息信号
+    cancel_finished = pyqtSignal()  # 已取消的工作线程全部退出信号
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.worker = None
+        # 已取消但尚未退出的工作线程，保留引用直到线程结束
+        self._cancelled_workers = set()
 
     def start_full_process(self, input_path, output_dir, config_path=None, params=None):
         """
@@ -434,11 +455,57 @@ class ProcessModule(QObject):
             self.worker.process_completed.connect(self.process_completed)
             self.worker.log_message.connect(self.log_message)
 
+    def disconnect_worker_signals(self):
+        """
+        断开工作线程的信号
+        """
+        if self.worker:
+            self.worker.progress_updated.disconnect(self.progress_updated)
+            self.worker.step_progress_updated.disconnect(self.step_progress_updated)
+            self.worker.process_completed.disconnect(self.process_completed)
+            self.worker.log_message.disconnect(self.log_message)
+
     def cancel_processing(self):
         """
         取消处理任务
+
+        不在界面线程中等待工作线程结束：断开其信号后让它在处理完当前文件时自行退出，
+        避免取消时界面卡住。线程退出前引用保留在_cancelled_workers中，全部退出后发出cancel_finished信号。
         """
         if self.worker and self.worker.isRunning():
-            self.worker.is_cancelled = True
+            worker = self.worker
+            worker.is_cancelled = True
             self.log_message.emit("正在取消处理任务...")
-            self.worker.wait()  # 等待线程结束
+
+            self.disconnect_worker_signals()
+            self.worker = None
+
+            self._cancelled_workers.add(worker)
+            worker.finished.connect(lambda: self._on_cancelled_worker_finished(worker))
+            if worker.isFinished():
+                self._on_cancelled_worker_finished(worker)
+
+    def _on_cancelled_worker_finished(self, worker):
+        """已取消的工作线程退出后释放引用，全部退出时发出cancel_finished信号"""
+        if worker not in self._cancelled_workers:
+            return
+        self._cancelled_workers.discard(worker)
+        if not self._cancelled_workers:
+            self.cancel_finished.emit()
+
+    def has_cancelled_workers(self):
+        """
+        是否还有已取消但尚未退出的工作线程
+
+        返回:
+            bool: 有则返回True，此时不应启动新的处理任务
+        """
+        return bool(self._cancelled_workers)
+
+    def wait_for_cancelled_workers(self):
+        """
+        阻塞等待所有已取消的工作线程退出，在程序退出前调用，避免线程仍在运行时被销毁
+        """
+        for worker in list(self._cancelled_workers):
+            worker.wait()
+        self._cancelled_workers.clear()
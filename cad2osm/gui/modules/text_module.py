@@ -43,6 +43,11 @@ class TextWorker(QThread):
         执行文本提取任务
         """
         try:
+            # 在工作线程中创建输出目录，避免慢速文件系统阻塞界面
+            output_dir = os.path.dirname(self.params.get('output_path') or '')
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+
             if self.mode == 'full':
                 self.run_full_process()
             elif self.mode == 'extract_only':
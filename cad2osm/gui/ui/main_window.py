@@ -222,6 +222,12 @@ class MainWindow(QMainWindow):
         settings.setValue("geometry", self.saveGeometry())
         settings.setValue("windowState", self.saveState())
 
+        # 写入尚未保存的项目配置
+        self.project_manager.flush_config()
+
+        # 等待已取消但尚未退出的处理线程结束，避免线程运行中被销毁
+        self.process_tab.process_module.wait_for_cancelled_workers()
+
         # 调用父类方法
         super().closeEvent(event)
 
@@ -26,6 +26,39 @@ from modules.merge_module import MergeModule
 # 导入语言管理器
 from utils.language_manager import tr
 
+# 导入进度刷新节流
+from utils.progress_throttle import ProgressThrottle
+
+# 本页用到的翻译键
+TRANSLATION_KEYS = (
+    "ui.input_settings",
+    "buttons.browse_ellipsis",
+    "files.reference_osm",
+    "buttons.add",
+    "buttons.remove",
+    "buttons.clear",
+    "files.target_osm",
+    "files.output_file",
+    "ui.parameter_settings",
+    "options.elevator",
+    "options.stairs",
+    "options.both",
+    "params.area_type",
+    "options.centroid",
+    "options.vertex_average",
+    "params.offset_method",
+    "params.min_matches",
+    "ui.result_statistics",
+    "stats.matched_areas",
+    "stats.lat_offset",
+    "stats.lon_offset",
+    "ui.progress_display",
+    "progress.overall",
+    "status.ready",
+    "buttons.start_merging",
+    "buttons.cancel",
+)
+
 class MergeTab(QWidget):
     """
     OSM合并标签页，用于合并多个OSM文件
@@ -40,6 +73,16 @@ class MergeTab(QWidget):
         # 保存项目管理器引用
         self.project_manager = project_manager
 
+        # 用于记住上次使用的目录和文件
+        self.settings = QSettings()
+
+        # 暂存的进度，由_flush_progress统一刷新
+        self._pending_progress = None
+        self._progress_throttle = ProgressThrottle(self._flush_progress, self)
+
+        # 上次写入统计标签的值，未变化时跳过格式化
+        self._last_stats = None
+
         # 初始化合并模块
         self.merge_module = MergeModule(self)
 
@@ -50,24 +93,32 @@ class MergeTab(QWidget):
         # 初始化UI
         self.init_ui()
 
+        # 恢复上次使用的参照文件（仍然存在时）
+        last_ref_file = self.settings.value("last_dir/ref_file", "") or ""
+        if last_ref_file and os.path.isfile(last_ref_file):
+            self.ref_path_edit.setText(last_ref_file)
+
     def init_ui(self):
         """初始化用户界面"""
+        # 一次性获取本页用到的全部翻译文本
+        t = self._translations()
+
         # 创建主布局
         main_layout = QVBoxLayout(self)
 
         # 创建输入区域
-        self.input_group = QGroupBox(tr("ui.input_settings"))
+        self.input_group = QGroupBox(t["ui.input_settings"])
         input_layout = QFormLayout()
 
         # 参照OSM文件选择
         self.ref_path_edit = QLineEdit()
-        self.browse_ref_btn = QPushButton(tr("buttons.browse_ellipsis"))
+        self.browse_ref_btn = QPushButton(t["buttons.browse_ellipsis"])
         self.browse_ref_btn.clicked.connect(self.browse_ref)
 
         ref_path_layout = QHBoxLayout()
         ref_path_layout.addWidget(self.ref_path_edit)
         ref_path_layout.addWidget(self.browse_ref_btn)
-        self.ref_label = QLabel(tr("files.reference_osm") + ":")
+        self.ref_label = QLabel(t["files.reference_osm"] + ":")
         input_layout.addRow(self.ref_label, ref_path_layout)
 
         # 目标OSM文件选择
@@ -79,11 +130,11 @@ class MergeTab(QWidget):
         target_list_layout.addWidget(self.target_list)
 
         target_buttons_layout = QHBoxLayout()
-        self.add_target_btn = QPushButton(tr("buttons.add"))
+        self.add_target_btn = QPushButton(t["buttons.add"])
         self.add_target_btn.clicked.connect(self.add_target)
-        self.remove_target_btn = QPushButton(tr("buttons.remove"))
+        self.remove_target_btn = QPushButton(t["buttons.remove"])
         self.remove_target_btn.clicked.connect(self.remove_target)
-        self.clear_targets_btn = QPushButton(tr("buttons.clear"))
+        self.clear_targets_btn = QPushButton(t["buttons.clear"])
         self.clear_targets_btn.clicked.connect(self.clear_targets)
 
         target_buttons_layout.addWidget(self.add_target_btn)
@@ -91,82 +142,82 @@ class MergeTab(QWidget):
         target_buttons_layout.addWidget(self.clear_targets_btn)
 
         target_list_layout.addLayout(target_buttons_layout)
-        self.target_label = QLabel(tr("files.target_osm") + ":")
+        self.target_label = QLabel(t["files.target_osm"] + ":")
         input_layout.addRow(self.target_label, target_list_layout)
 
         # 输出文件路径
         self.output_path_edit = QLineEdit()
-        self.browse_output_btn = QPushButton(tr("buttons.browse_ellipsis"))
+        self.browse_output_btn = QPushButton(t["buttons.browse_ellipsis"])
         self.browse_output_btn.clicked.connect(self.browse_output)
 
         output_path_layout = QHBoxLayout()
         output_path_layout.addWidget(self.output_path_edit)
         output_path_layout.addWidget(self.browse_output_btn)
-        self.output_label = QLabel(tr("files.output_file") + ":")
+        self.output_label = QLabel(t["files.output_file"] + ":")
         input_layout.addRow(self.output_label, output_path_layout)
 
         self.input_group.setLayout(input_layout)
         main_layout.addWidget(self.input_group)
 
         # 创建参数设置区域
-        self.params_group = QGroupBox(tr("ui.parameter_settings"))
+        self.params_group = QGroupBox(t["ui.parameter_settings"])
         params_layout = QFormLayout()
 
         # 匹配区域类型选择
         self.area_type_combo = QComboBox()
-        self.area_type_combo.addItems([tr("options.elevator"), tr("options.stairs"), tr("options.both")])
+        self.area_type_combo.addItems([t["options.elevator"], t["options.stairs"], t["options.both"]])
         self.area_type_combo.setCurrentIndex(2)  # 默认选择"两者"
-        self.area_type_label = QLabel(tr("params.area_type") + ":")
+        self.area_type_label = QLabel(t["params.area_type"] + ":")
         params_layout.addRow(self.area_type_label, self.area_type_combo)
 
         # 偏移计算方法选择
         self.offset_method_combo = QComboBox()
-        self.offset_method_combo.addItems([tr("options.centroid"), tr("options.vertex_average")])
+        self.offset_method_combo.addItems([t["options.centroid"], t["options.vertex_average"]])
         self.offset_method_combo.setCurrentIndex(1)  # 默认选择"顶点平均"
-        self.offset_method_label = QLabel(tr("params.offset_method") + ":")
+        self.offset_method_label = QLabel(t["params.offset_method"] + ":")
         params_layout.addRow(self.offset_method_label, self.offset_method_combo)
 
         # 最小匹配区域数量设置
         self.min_matches_spin = QSpinBox()
         self.min_matches_spin.setRange(1, 10)
         self.min_matches_spin.setValue(2)
-        self.min_matches_label = QLabel(tr("params.min_matches") + ":")
+        self.min_matches_label = QLabel(t["params.min_matches"] + ":")
         params_layout.addRow(self.min_matches_label, self.min_matches_spin)
 
         self.params_group.setLayout(params_layout)
         main_layout.addWidget(self.params_group)
 
         # 创建结果统计区域
-        self.stats_group = QGroupBox(tr("ui.result_statistics"))
+        self.stats_group = QGroupBox(t["ui.result_statistics"])
         stats_layout = QFormLayout()
 
         self.matched_areas_label = QLabel("0")
-        self.matched_areas_stat_label = QLabel(tr("stats.matched_areas") + ":")
+        self.matched_areas_stat_label = QLabel(t["stats.matched_areas"] + ":")
         stats_layout.addRow(self.matched_areas_stat_label, self.matched_areas_label)
 
         self.lat_offset_label = QLabel("0.0")
-        self.lat_offset_stat_label = QLabel(tr("stats.lat_offset") + ":")
+        self.lat_offset_stat_label = QLabel(t["stats.lat_offset"] + ":")
         stats_layout.addRow(self.lat_offset_stat_label, self.lat_offset_label)
 
         self.lon_offset_label = QLabel("0.0")
-        self.lon_offset_stat_label = QLabel(tr("stats.lon_offset") + ":")
+        self.lon_offset_stat_label = QLabel(t["stats.lon_offset"] + ":")
         stats_layout.addRow(self.lon_offset_stat_label, self.lon_offset_label)
 
         self.stats_group.setLayout(stats_layout)
         main_layout.addWidget(self.stats_group)
 
         # 创建进度显示区域
-        self.progress_group = QGroupBox(tr("ui.progress_display"))
+        self.progress_group = QGroupBox(t["ui.progress_display"])
         progress_layout = QVBoxLayout()
 
         # 总体进度条
-        self.overall_progress_label = QLabel(tr("progress.overall") + ":")
+        self.overall_progress_label = QLabel(t["progress.overall"] + ":")
         progress_layout.addWidget(self.overall_progress_label)
         self.total_progress_bar = QProgressBar()
         progress_layout.addWidget(self.total_progress_bar)
 
         # 处理状态文本
-        self.status_label = QLabel(tr("status.ready"))
+        self.status_label = QLabel(t["status.ready"])
         progress_layout.addWidget(self.status_label)
 
         self.progress_group.setLayout(progress_layout)
@@ -175,10 +226,10 @@ class MergeTab(QWidget):
         # 创建按钮区域
         button_layout = QHBoxLayout()
 
-        self.start_button = QPushButton(tr("buttons.start_merging"))
+        self.start_button = QPushButton(t["buttons.start_merging"])
         self.start_button.clicked.connect(self.start_merging)
 
-        self.cancel_button = QPushButton(tr("buttons.cancel"))
+        self.cancel_button = QPushButton(t["buttons.cancel"])
         self.cancel_button.clicked.connect(self.cancel_merging)
         self.cancel_button.setEnabled(False)
 
@@ -191,9 +242,11 @@ class MergeTab(QWidget):
     def browse_ref(self):
         """浏览参照OSM文件"""
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "选择参照OSM文件", "", "OSM文件 (*.osm)"
+            self, "选择参照OSM文件", self.settings.value("last_dir/ref", "") or "", "OSM文件 (*.osm)"
         )
         if file_path:
+            self.settings.setValue("last_dir/ref", os.path.dirname(file_path))
+            self.settings.setValue("last_dir/ref_file", file_path)
             self.ref_path_edit.setText(file_path)
             # 自动设置输出文件路径
             self.suggest_output_path(file_path)
@@ -201,8 +254,10 @@ class MergeTab(QWidget):
     def add_target(self):
         """添加目标OSM文件"""
         file_paths, _ = QFileDialog.getOpenFileNames(
-            self, "选择目标OSM文件", "", "OSM文件 (*.osm)"
+            self, "选择目标OSM文件", self.settings.value("last_dir/target", "") or "", "OSM文件 (*.osm)"
         )
+        if file_paths:
+            self.settings.setValue("last_dir/target", os.path.dirname(file_paths[0]))
         for file_path in file_paths:
             # 检查是否已经在列表中
             items = self.target_list.findItems(file_path, Qt.MatchExactly)
@@ -221,30 +276,23 @@ class MergeTab(QWidget):
     def browse_output(self):
         """浏览输出文件"""
         file_path, _ = QFileDialog.getSaveFileName(
-            self, "选择输出文件", "", "OSM文件 (*.osm)"
+            self, "选择输出文件", self.settings.value("last_dir/output", "") or "", "OSM文件 (*.osm)"
         )
         if file_path:
+            self.settings.setValue("last_dir/output", os.path.dirname(file_path))
             self.output_path_edit.setText(file_path)
 
     def suggest_output_path(self, ref_path):
         """根据参照文件路径自动建议输出文件路径"""
         if not self.output_path_edit.text():
             ref_file = Path(ref_path)
-            # 尝试找到标准输出目录
-            try:
-                project_dir = ref_file.parent
-                while project_dir.name not in ['osm', ''] and project_dir.parent != project_dir:
-                    project_dir = project_dir.parent
-
-                if project_dir.name == 'osm':
-                    # 找到了osm目录，建议使用标准输出路径
-                    output_dir = project_dir / 'merged'
-                    output_dir.mkdir(parents=True, exist_ok=True)
-                    output_path = output_dir / f"{ref_file.stem}_merged.osm"
-                    self.output_path_edit.setText(str(output_path))
-                    return
-            except Exception:
-                pass
+            # 只在内存中推算路径，输出目录由start_merging创建
+            osm_dir = next((p for p in ref_file.parents if p.name == 'osm'), None)
+            if osm_dir is not None:
+                # 找到了osm目录，建议使用标准输出路径
+                output_path = osm_dir / 'merged' / f"{ref_file.stem}_merged.osm"
+                self.output_path_edit.setText(str(output_path))
+                return
 
             # 如果无法确定标准路径，则使用参照文件所在目录
             output_path = ref_file.with_name(f"{ref_file.stem}_merged.osm")
@@ -288,6 +336,7 @@ class MergeTab(QWidget):
         self.matched_areas_label.setText("0")
         self.lat_offset_label.setText("0.0")
         self.lon_offset_label.setText("0.0")
+        self._last_stats = None
 
         # 更新状态
         self.status_label.setText("正在处理...")
@@ -303,9 +352,7 @@ class MergeTab(QWidget):
             output_path=output_path,
             area_type=area_type,
             offset_method=offset_method,
-            min_matches=min_matches,
-            progress_callback=self.update_progress,
-            completion_callback=self.merging_completed
+            min_matches=min_matches
         )
 
     def cancel_merging(self):
@@ -313,6 +360,9 @@ class MergeTab(QWidget):
         # 调用合并模块的取消方法
         self.merge_module.cancel_merging()
 
+        # 丢弃尚未刷新的进度
+        self._pending_progress = None
+
         # 更新UI状态
         self.status_label.setText("已取消")
         self.start_button.setEnabled(True)
@@ -321,8 +371,8 @@ class MergeTab(QWidget):
         # 记录日志
         self.log_message.emit("OSM合并已取消")
 
-    def update_progress_signal(self, progress, status=None):
-        """更新进度（信号连接用）"""
+    def update_progress_signal(self, progress, matched_areas, lat_offset, lon_offset, status):
+        """更新进度和统计信息（信号连接用）"""
         # 处理不同类型的进度值
         if isinstance(progress, (int, float)):
             if progress <= 1.0:
@@ -334,61 +384,55 @@ class MergeTab(QWidget):
         else:
             progress_value = 0
 
-        # 更新进度条
-        self.total_progress_bar.setValue(progress_value)
+        # 暂存最新进度，空状态文本沿用上一次暂存的值
+        if not status and self._pending_progress is not None:
+            status = self._pending_progress[4]
+        self._pending_progress = (progress_value, matched_areas, lat_offset, lon_offset, status)
 
-        # 更新状态文本
-        if status is not None:
-            self.status_label.setText(status)
+        # 限制刷新频率，避免进度信号过多导致界面卡顿
+        self._progress_throttle.request()
 
-    def merging_completed_signal(self, success, message):
-        """合并完成（信号连接用）"""
-        # 更新UI状态
-        self.start_button.setEnabled(True)
-        self.cancel_button.setEnabled(False)
+    def _flush_progress(self):
+        """将暂存的进度写入进度条、统计信息和状态文本"""
+        if self._pending_progress is None:
+            return
 
-        if success:
-            # 成功完成
-            self.status_label.setText("完成")
-            self.total_progress_bar.setValue(100)
-            self.log_message.emit(f"OSM合并完成: {message}")
-            QMessageBox.information(self, "合并完成",
-                                   f"OSM合并已完成！\n\n{message}")
-        else:
-            # 处理失败
-            self.status_label.setText("失败")
-            self.log_message.emit(f"OSM合并失败: {message}")
-            QMessageBox.warning(self, "合并失败", f"OSM合并过程中出现错误:\n\n{message}")
+        progress_value, matched_areas, lat_offset, lon_offset, status = self._pending_progress
+        self._pending_progress = None
 
-    def update_progress(self, progress, matched_areas=None, lat_offset=None, lon_offset=None, status=None):
-        """更新进度和状态"""
         # 更新进度条
-        self.total_progress_bar.setValue(int(progress * 100))
+        self.total_progress_bar.setValue(progress_value)
 
-        # 更新统计信息
-        if matched_areas is not None:
-            self.matched_areas_label.setText(str(matched_areas))
+        # 更新统计信息（统计区域不可见时跳过，下次刷新再补上）
+        if self.stats_group.isVisible():
+            self.update_stats(matched_areas, lat_offset, lon_offset)
 
-        if lat_offset is not None:
-            self.lat_offset_label.setText(f"{lat_offset:.6f}")
+        # 更新状态文本
+        if status:
+            self.status_label.setText(status)
 
-        if lon_offset is not None:
+    def update_stats(self, matched_areas, lat_offset, lon_offset):
+        """更新统计标签，只重新格式化发生变化的值"""
+        last = self._last_stats or (None, None, None)
+        if matched_areas != last[0]:
+            self.matched_areas_label.setText(str(matched_areas))
+        if lat_offset != last[1]:
+            self.lat_offset_label.setText(f"{lat_offset:.6f}")
+        if lon_offset != last[2]:
             self.lon_offset_label.setText(f"{lon_offset:.6f}")
+        self._last_stats = (matched_areas, lat_offset, lon_offset)
 
-        # 更新状态文本
-        if status is not None:
-            self.status_label.setText(status)
+    def merging_completed_signal(self, success, message, matched_areas, lat_offset, lon_offset):
+        """合并完成（信号连接用）"""
+        # 先刷新暂存的进度，避免其覆盖最终状态
+        self._progress_throttle.flush()
 
-    def merging_completed(self, success, message, matched_areas=0, lat_offset=0.0, lon_offset=0.0):
-        """合并完成回调"""
         # 更新UI状态
         self.start_button.setEnabled(True)
         self.cancel_button.setEnabled(False)
 
         # 更新统计信息
-        self.matched_areas_label.setText(str(matched_areas))
-        self.lat_offset_label.setText(f"{lat_offset:.6f}")
-        self.lon_offset_label.setText(f"{lon_offset:.6f}")
+        self.update_stats(matched_areas, lat_offset, lon_offset)
 
         if success:
             # 成功完成
@@ -396,54 +440,65 @@ class MergeTab(QWidget):
             self.total_progress_bar.setValue(100)
             self.log_message.emit(f"OSM合并完成: {message}")
             QMessageBox.information(self, "合并完成",
-                                   f"OSM合并已完成。\n\n匹配区域数量: {matched_areas}\n纬度偏移量: {lat_offset:.6f}\n经度偏移量: {lon_offset:.6f}")
+                                   f"OSM合并已完成。\n\n{message}\n\n匹配区域数量: {matched_areas}\n纬度偏移量: {lat_offset:.6f}\n经度偏移量: {lon_offset:.6f}")
         else:
             # 处理失败
             self.status_label.setText("失败")
             self.log_message.emit(f"OSM合并失败: {message}")
-            QMessageBox.warning(self, "合并失败", f"OSM合并过程中出现错误: {message}")
+            QMessageBox.warning(self, "合并失败", f"OSM合并过程中出现错误:\n\n{message}")
+
+    def _translations(self):
+        """返回本页用到的全部翻译文本，每个键只查询一次"""
+        return {key: tr(key) for key in TRANSLATION_KEYS}
 
     def on_language_changed(self):
         """响应语言切换事件"""
+        # 一次性获取本页用到的全部翻译文本
+        t = self._translations()
+
         # 更新组框标题
-        self.input_group.setTitle(tr("ui.input_settings"))
-        self.params_group.setTitle(tr("ui.parameter_settings"))
-        self.stats_group.setTitle(tr("ui.result_statistics"))
-        self.progress_group.setTitle(tr("ui.progress_display"))
+        self.input_group.setTitle(t["ui.input_settings"])
+        self.params_group.setTitle(t["ui.parameter_settings"])
+        self.stats_group.setTitle(t["ui.result_statistics"])
+        self.progress_group.setTitle(t["ui.progress_display"])
 
         # 更新文件标签
-        self.ref_label.setText(tr("files.reference_osm") + ":")
-        self.target_label.setText(tr("files.target_osm") + ":")
-        self.output_label.setText(tr("files.output_file") + ":")
+        self.ref_label.setText(t["files.reference_osm"] + ":")
+        self.target_label.setText(t["files.target_osm"] + ":")
+        self.output_label.setText(t["files.output_file"] + ":")
 
         # 更新参数标签
-        self.area_type_label.setText(tr("params.area_type") + ":")
-        self.offset_method_label.setText(tr("params.offset_method") + ":")
-        self.min_matches_label.setText(tr("params.min_matches") + ":")
+        self.area_type_label.setText(t["params.area_type"] + ":")
+        self.offset_method_label.setText(t["params.offset_method"] + ":")
+        self.min_matches_label.setText(t["params.min_matches"] + ":")
 
-        # 更新下拉框选项
+        # 更新下拉框选项，重新填充期间屏蔽信号，避免触发多余的currentIndexChanged
+        self.area_type_combo.blockSignals(True)
         self.area_type_combo.clear()
-        self.area_type_combo.addItems([tr("options.elevator"), tr("options.stairs"), tr("options.both")])
+        self.area_type_combo.addItems([t["options.elevator"], t["options.stairs"], t["options.both"]])
         self.area_type_combo.setCurrentIndex(2)
+        self.area_type_combo.blockSignals(False)
 
+        self.offset_method_combo.blockSignals(True)
         self.offset_method_combo.clear()
-        self.offset_method_combo.addItems([tr("options.centroid"), tr("options.vertex_average")])
+        self.offset_method_combo.addItems([t["options.centroid"], t["options.vertex_average"]])
         self.offset_method_combo.setCurrentIndex(1)
+        self.offset_method_combo.blockSignals(False)
 
         # 更新统计标签
-        self.matched_areas_stat_label.setText(tr("stats.matched_areas") + ":")
-        self.lat_offset_stat_label.setText(tr("stats.lat_offset") + ":")
-        self.lon_offset_stat_label.setText(tr("stats.lon_offset") + ":")
+        self.matched_areas_stat_label.setText(t["stats.matched_areas"] + ":")
+        self.lat_offset_stat_label.setText(t["stats.lat_offset"] + ":")
+        self.lon_offset_stat_label.setText(t["stats.lon_offset"] + ":")
 
         # 更新进度标签
-        self.overall_progress_label.setText(tr("progress.overall") + ":")
-        self.status_label.setText(tr("status.ready"))
+        self.overall_progress_label.setText(t["progress.overall"] + ":")
+        self.status_label.setText(t["status.ready"])
 
         # 更新按钮文本
-        self.browse_ref_btn.setText(tr("buttons.browse_ellipsis"))
-        self.browse_output_btn.setText(tr("buttons.browse_ellipsis"))
-        self.add_target_btn.setText(tr("buttons.add"))
-        self.remove_target_btn.setText(tr("buttons.remove"))
-        self.clear_targets_btn.setText(tr("buttons.clear"))
-        self.start_button.setText(tr("buttons.start_merging"))
-        self.cancel_button.setText(tr("buttons.cancel"))
+        self.browse_ref_btn.setText(t["buttons.browse_ellipsis"])
+        self.browse_output_btn.setText(t["buttons.browse_ellipsis"])
+        self.add_target_btn.setText(t["buttons.add"])
+        self.remove_target_btn.setText(t["buttons.remove"])
+        self.clear_targets_btn.setText(t["buttons.clear"])
+        self.start_button.setText(t["buttons.start_merging"])
+        self.cancel_button.setText(t["buttons.cancel"])
@@ -17,7 +17,7 @@ from PyQt5.QtWidgets import (
     QSpinBox, QDoubleSpinBox, QProgressBar, QGroupBox,
     QFormLayout, QRadioButton, QButtonGroup, QMessageBox
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QThread, QSettings
+from PyQt5.QtCore import Qt, pyqtSignal, pyqtSlot, QThread, QSettings, QTimer
 
 # 导入处理模块
 from modules.process_module import ProcessModule
@@ -28,6 +28,10 @@ from .semi_process_tab import SemiProcessTab
 # 导入语言管理器
 from utils.language_manager import tr
 
+# 日志批量转发的间隔（毫秒）和缓冲上限
+LOG_FLUSH_INTERVAL_MS = 100
+LOG_BUFFER_LIMIT = 500
+
 class ProcessTab(QWidget):
     """
     CAD预处理标签页，包含完整流程和半自动流程两个子标签页
@@ -39,14 +43,25 @@ class ProcessTab(QWidget):
     def __init__(self, project_manager):
         super().__init__()
 
+        # 设置对象名，便于子标签页通过findChild定位本标签页
+        self.setObjectName("process_tab")
+
         # 保存项目管理器引用
         self.project_manager = project_manager
 
         # 初始化处理模块
         self.process_module = ProcessModule(self)
 
-        # 跟踪当前正在运行的标签页
+        # 跟踪当前正在运行的标签页，以及处理模块信号到该标签页的直接连接
         self.active_processing_tab = None
+        self._active_connections = []
+
+        # 子标签页的日志先缓存，再按固定间隔合并转发到主窗口
+        self._log_buffer = []
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self._log_flush_timer.timeout.connect(self._flush_logs)
 
         # 初始化UI
         self.init_ui()
@@ -61,9 +76,7 @@ class ProcessTab(QWidget):
         project_layout = QHBoxLayout()
 
         self.project_combo = QComboBox()
-        self.project_combo.addItems(self.project_manager.get_project_list())
-        if self.project_manager.get_current_project():
-            self.project_combo.setCurrentText(self.project_manager.get_current_project())
+        self.refresh_projects()
 
         self.refresh_project_btn = QPushButton(tr("project.refresh"))
         self.refresh_project_btn.clicked.connect(self.refresh_projects)
@@ -79,72 +92,109 @@ class ProcessTab(QWidget):
         # 创建子标签页
         self.tab_widget = QTabWidget()
 
-        # 创建完整流程标签页
-        self.full_process_tab = FullProcessTab(self.project_manager, self.process_module)
-        self.full_process_tab.log_message.connect(self.forward_log_message)
-
-        # 创建半自动流程标签页
-        self.semi_process_tab = SemiProcessTab(self.project_manager, self.process_module)
-        self.semi_process_tab.log_message.connect(self.forward_log_message)
-
-        # 连接进程模块的信号到当前活动的标签页
-        self.process_module.progress_updated.connect(self.route_progress_signal)
-        self.process_module.step_progress_updated.connect(self.route_step_progress_signal)
-        self.process_module.process_completed.connect(self.route_completion_signal)
-
-        # 添加子标签页
-        self.tab_widget.addTab(self.full_process_tab, tr("tabs.full_process"))
-        self.tab_widget.addTab(self.semi_process_tab, tr("tabs.semi_process"))
+        # 子标签页在首次切换到时才创建，先添加占位部件
+        self.full_process_tab = None
+        self.semi_process_tab = None
+        self.tab_widget.addTab(QWidget(), tr("tabs.full_process"))
+        self.tab_widget.addTab(QWidget(), tr("tabs.semi_process"))
+        self.tab_widget.currentChanged.connect(self.ensure_sub_tab)
+        self.ensure_sub_tab(self.tab_widget.currentIndex())
 
         main_layout.addWidget(self.tab_widget)
 
+    @pyqtSlot(int)
+    def ensure_sub_tab(self, index):
+        """首次切换到子标签页时创建它，并替换对应的占位部件"""
+        if index == 0 and self.full_process_tab is None:
+            # 创建完整流程标签页
+            self.full_process_tab = tab = FullProcessTab(self.project_manager, self.process_module, process_tab=self)
+        elif index == 1 and self.semi_process_tab is None:
+            # 创建半自动流程标签页
+            self.semi_process_tab = tab = SemiProcessTab(self.project_manager, self.process_module, process_tab=self)
+        else:
+            return
+
+        tab.log_message.connect(self.forward_log_message)
+
+        # 替换占位部件，期间屏蔽信号，避免重复触发currentChanged；
+        # 同时暂停重绘，只在替换完成后重新布局和绘制一次
+        placeholder = self.tab_widget.widget(index)
+        title = self.tab_widget.tabText(index)
+        self.tab_widget.setUpdatesEnabled(False)
+        self.tab_widget.blockSignals(True)
+        self.tab_widget.removeTab(index)
+        self.tab_widget.insertTab(index, tab, title)
+        self.tab_widget.setCurrentIndex(index)
+        self.tab_widget.blockSignals(False)
+        self.tab_widget.setUpdatesEnabled(True)
+        placeholder.deleteLater()
+
+    @pyqtSlot()
     def refresh_projects(self):
         """刷新项目列表"""
         # 保存当前选择
         current_project = self.project_combo.currentText()
 
-        # 清空并重新加载项目列表
+        projects = self.project_manager.get_project_list()
+        project_manager_current = self.project_manager.get_current_project()
+
+        # 清空并重新加载项目列表，期间屏蔽信号，避免触发多余的currentIndexChanged
+        self.project_combo.blockSignals(True)
         self.project_combo.clear()
-        self.project_combo.addItems(self.project_manager.get_project_list())
+        self.project_combo.addItems(projects)
 
         # 如果原项目仍然存在，则选中它
-        if current_project in self.project_manager.get_project_list():
+        if current_project in projects:
             self.project_combo.setCurrentText(current_project)
-        elif self.project_manager.get_current_project():
-            self.project_combo.setCurrentText(self.project_manager.get_current_project())
+        elif project_manager_current:
+            self.project_combo.setCurrentText(project_manager_current)
+        self.project_combo.blockSignals(False)
 
+    @pyqtSlot(str)
     def forward_log_message(self, message):
-        """转发日志消息到主窗口"""
-        self.log_message.emit(message)
-
-    def route_progress_signal(self, progress, status=None):
-        """根据正在运行的标签页路由进度信号"""
-        if self.active_processing_tab == 'full':
-            self.full_process_tab.update_progress(progress, status)
-        elif self.active_processing_tab == 'semi':
-            self.semi_process_tab.update_progress(progress, status)
-
-    def route_step_progress_signal(self, progress, status=None):
-        """根据正在运行的标签页路由步骤进度信号"""
-        if self.active_processing_tab == 'full':
-            self.full_process_tab.update_step_progress(progress, status)
-        elif self.active_processing_tab == 'semi':
-            self.semi_process_tab.update_step_progress(progress, status)
-
-    def route_completion_signal(self, success, message):
-        """根据正在运行的标签页路由完成信号"""
-        if self.active_processing_tab == 'full':
-            self.full_process_tab.processing_completed(success, message)
-        elif self.active_processing_tab == 'semi':
-            self.semi_process_tab.processing_completed(success, message)
-
-        # 处理完成后重置活动标签页
-        self.active_processing_tab = None
+        """缓存日志消息，定时批量转发到主窗口"""
+        self._log_buffer.append(message)
+        if len(self._log_buffer) >= LOG_BUFFER_LIMIT:
+            self._flush_logs()
+        elif not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+
+    @pyqtSlot()
+    def _flush_logs(self):
+        """将缓存的日志合并为一条消息转发到主窗口"""
+        self._log_flush_timer.stop()
+        if self._log_buffer:
+            self.log_message.emit("\n".join(self._log_buffer))
+            self._log_buffer.clear()
+
+    @pyqtSlot(bool, str)
+    def on_processing_finished(self, success, message):
+        """处理完成后断开信号并重置活动标签页"""
+        self.set_active_processing_tab(None)
 
     def set_active_processing_tab(self, tab_type):
-        """设置当前正在运行的标签页"""
+        """设置当前正在运行的标签页，并将处理模块的信号直接连接到该标签页"""
+        # 断开上一次运行的连接
+        for signal, slot in self._active_connections:
+            signal.disconnect(slot)
+        self._active_connections = []
         self.active_processing_tab = tab_type
 
+        tabs = {'full': self.full_process_tab, 'semi': self.semi_process_tab}
+        tab = tabs.get(tab_type)
+        if tab is None:
+            return
+
+        # 完成信号先交给标签页处理，再由本标签页断开连接
+        self._active_connections = [
+            (self.process_module.progress_updated, tab.update_progress),
+            (self.process_module.step_progress_updated, tab.update_step_progress),
+            (self.process_module.process_completed, tab.processing_completed),
+            (self.process_module.process_completed, self.on_processing_finished),
+        ]
+        for signal, slot in self._active_connections:
+            signal.connect(slot)
+
     def on_language_changed(self):
         """响应语言切换事件"""
         # 更新项目选择区域
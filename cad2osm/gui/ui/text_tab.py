@@ -7,26 +7,110 @@
 """
 
 import os
-import sys
+from collections import OrderedDict
 from pathlib import Path
 
 # 导入PyQt5组件
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QLabel, QLineEdit, QFileDialog, QComboBox, QCheckBox,
+    QLabel, QLineEdit, QFileDialog, QCheckBox,
     QSpinBox, QDoubleSpinBox, QProgressBar, QGroupBox,
     QFormLayout, QGridLayout, QRadioButton, QButtonGroup, QMessageBox,
     QTextEdit, QScrollArea, QSizePolicy
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QThread, QSettings
-from PyQt5.QtGui import QPixmap, QImage
-
-# 导入文本提取模块
-from modules.text_module import TextModule
+from PyQt5.QtCore import (
+    Qt, pyqtSignal, pyqtSlot, QSettings, QTimer, QBuffer, QIODevice,
+    QObject, QRunnable, QThreadPool
+)
+from PyQt5.QtGui import QPixmap, QImageReader, QImageIOHandler
 
 # 导入语言管理器
 from utils.language_manager import tr
 
+# 导入进度刷新节流
+from utils.progress_throttle import ProgressThrottle
+
+# 最多缓存的已解码预览图像数量
+PREVIEW_CACHE_SIZE = 4
+
+# 日志批量转发的间隔（毫秒）和缓冲上限
+LOG_FLUSH_INTERVAL_MS = 100
+LOG_BUFFER_LIMIT = 500
+
+# 过滤文本编辑停止多久后重新解析（毫秒）
+FILTER_PARSE_DELAY_MS = 300
+
+# 文件对话框的标题和文件过滤器，均为(翻译键, 缺少翻译时使用的默认文本)
+FILE_DIALOG_TEXTS = {
+    'dxf': (("dialogs.select_dxf_file", "选择DXF文件"), ("dialogs.dxf_files", "DXF文件 (*.dxf)")),
+    'bounds': (("dialogs.select_bounds_file", "选择边界文件"), ("dialogs.json_files", "JSON文件 (*.json)")),
+    'osm': (("dialogs.select_osm_file", "选择OSM文件"), ("dialogs.osm_files", "OSM文件 (*.osm)")),
+    'text': (("dialogs.select_text_file", "选择文本文件"), ("dialogs.json_files", "JSON文件 (*.json)")),
+    'output_json': (("dialogs.select_output_file", "选择输出文件"), ("dialogs.json_files", "JSON文件 (*.json)")),
+    'output_osm': (("dialogs.select_output_file", "选择输出文件"), ("dialogs.osm_files", "OSM文件 (*.osm)")),
+    'config': (("dialogs.select_config_file", "选择配置文件"), ("dialogs.yaml_files", "YAML文件 (*.yaml *.yml)")),
+}
+
+# 各处理模式下需要启用的输入项：1完整流程，2仅提取文本，3仅匹配文本
+MODE_ENABLED_INPUTS = {
+    1: {'dxf': True, 'bounds': True, 'osm': True, 'text': False},
+    2: {'dxf': True, 'bounds': False, 'osm': False, 'text': False},
+    3: {'dxf': False, 'bounds': True, 'osm': True, 'text': True},
+}
+
+# 本页用到的翻译键
+TRANSLATION_KEYS = (
+    "ui.processing_mode",
+    "modes.full_process",
+    "modes.extract_only",
+    "modes.match_only",
+    "ui.input_settings",
+    "files.dxf_file",
+    "buttons.browse_ellipsis",
+    "files.bounds_file",
+    "files.osm_file",
+    "files.text_file",
+    "files.output_file",
+    "files.config_file_optional",
+    "ui.parameter_settings",
+    "params.layer_name",
+    "params.nearby_threshold",
+    "params.center_distance_ratio",
+    "params.visualize",
+    "ui.filter_settings",
+    "rules.filter_text_description",
+    "hints.filter_text_placeholder",
+    "ui.progress_display",
+    "progress.overall",
+    "progress.current_step",
+    "status.ready",
+    "ui.result_preview",
+    "hints.preview_placeholder",
+    "buttons.start_processing",
+    "buttons.cancel",
+)
+
+class SuggestPathsSignals(QObject):
+    """建议路径任务的信号，QRunnable本身不能定义信号"""
+
+    # 参数为DXF文件路径和建议的路径字典
+    finished = pyqtSignal(str, dict)
+
+
+class SuggestPathsWorker(QRunnable):
+    """
+    在线程池中查找与DXF文件对应的其他文件，避免网络驱动器上的文件系统访问阻塞界面
+    """
+
+    def __init__(self, dxf_path):
+        super().__init__()
+        self.dxf_path = dxf_path
+        self.signals = SuggestPathsSignals()
+
+    def run(self):
+        self.signals.finished.emit(self.dxf_path, TextTab.find_suggested_paths(self.dxf_path))
+
+
 class TextTab(QWidget):
     """
     文本提取标签页，用于从DXF文件提取文本并添加到OSM文件
@@ -41,30 +125,73 @@ class TextTab(QWidget):
         # 保存项目管理器引用
         self.project_manager = project_manager
 
-        # 初始化文本提取模块
-        self.text_module = TextModule(self)
+        # 用于记住上次使用的目录
+        self.settings = QSettings()
+
+        # 文本提取模块在首次开始处理时才创建，见text_module属性
+        self._text_module = None
 
-        # 连接文本模块的信号
-        self.text_module.progress_updated.connect(self.update_progress_signal)
-        self.text_module.step_progress_updated.connect(self.update_step_progress_signal)
-        self.text_module.process_completed.connect(self.processing_completed)
+        # 日志缓冲，定时合并后转发到主窗口
+        self._log_buffer = []
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self._log_flush_timer.timeout.connect(self._flush_logs)
+
+        # 暂存的进度，由_flush_progress统一刷新
+        self._pending_total = None
+        self._pending_step = None
+        self._pending_status = None
+        self._pending_preview = None
+        self._progress_throttle = ProgressThrottle(self._flush_progress, self)
+
+        # 正在查找建议路径的DXF文件及其任务，只采用最近一次选择的结果
+        self._suggest_dxf_path = None
+        self._suggest_worker = None
+
+        # 当前显示的预览图像标识和最近解码的预览缓存，用于跳过重复的解码和缩放
+        self._preview_key = None
+        self._preview_cache = OrderedDict()
 
         # 初始化UI
         self.init_ui()
 
+        # 文件对话框的标题和过滤器，语言切换时重新生成
+        self._dialog_texts = self._build_dialog_texts()
+
+    @property
+    def text_module(self):
+        """文本提取模块，首次使用时创建并连接信号"""
+        if self._text_module is None:
+            # 文本提取模块会导入ezdxf等较重的依赖，推迟到首次使用时再导入
+            from modules.text_module import TextModule
+
+            self._text_module = TextModule(self)
+
+            # 连接文本模块的信号
+            self._text_module.progress_updated.connect(self.update_progress_signal)
+            self._text_module.step_progress_updated.connect(self.update_step_progress_signal)
+            self._text_module.process_completed.connect(self.processing_completed)
+            self._text_module.log_message.connect(self.forward_log_message)
+            self._text_module.visualization_ready.connect(self.show_visualization)
+        return self._text_module
+
     def init_ui(self):
         """初始化用户界面"""
+        # 一次性获取本页用到的全部翻译文本
+        t = self._translations()
+
         # 创建主布局
         main_layout = QVBoxLayout(self)
 
         # 创建模式选择区域
-        self.mode_group_box = QGroupBox(tr("ui.processing_mode"))
+        self.mode_group_box = QGroupBox(t["ui.processing_mode"])
         mode_layout = QHBoxLayout()
 
         self.mode_group = QButtonGroup(self)
-        self.full_mode_radio = QRadioButton(tr("modes.full_process"))
-        self.extract_only_radio = QRadioButton(tr("modes.extract_only"))
-        self.match_only_radio = QRadioButton(tr("modes.match_only"))
+        self.full_mode_radio = QRadioButton(t["modes.full_process"])
+        self.extract_only_radio = QRadioButton(t["modes.extract_only"])
+        self.match_only_radio = QRadioButton(t["modes.match_only"])
 
         self.mode_group.addButton(self.full_mode_radio, 1)
         self.mode_group.addButton(self.extract_only_radio, 2)
@@ -80,15 +207,15 @@ class TextTab(QWidget):
         main_layout.addWidget(self.mode_group_box)
 
         # 创建输入区域
-        self.input_group = QGroupBox(tr("ui.input_settings"))
+        self.input_group = QGroupBox(t["ui.input_settings"])
         input_layout = QGridLayout()
         input_layout.setSpacing(10)  # 设置间距
 
         # 第一行：DXF文件选择 和 边界文件选择
         # DXF文件选择
-        self.dxf_label = QLabel(tr("files.dxf_file") + ":")
+        self.dxf_label = QLabel(t["files.dxf_file"] + ":")
         self.dxf_path_edit = QLineEdit()
-        self.browse_dxf_btn = QPushButton(tr("buttons.browse_ellipsis"))
+        self.browse_dxf_btn = QPushButton(t["buttons.browse_ellipsis"])
         self.browse_dxf_btn.clicked.connect(self.browse_dxf)
 
         dxf_path_layout = QHBoxLayout()
@@ -99,9 +226,9 @@ class TextTab(QWidget):
         input_layout.addLayout(dxf_path_layout, 0, 1)
 
         # 边界文件选择
-        self.bounds_label = QLabel(tr("files.bounds_file") + ":")
+        self.bounds_label = QLabel(t["files.bounds_file"] + ":")
         self.bounds_path_edit = QLineEdit()
-        self.browse_bounds_btn = QPushButton(tr("buttons.browse_ellipsis"))
+        self.browse_bounds_btn = QPushButton(t["buttons.browse_ellipsis"])
         self.browse_bounds_btn.clicked.connect(self.browse_bounds)
 
         bounds_path_layout = QHBoxLayout()
@@ -113,9 +240,9 @@ class TextTab(QWidget):
 
         # 第二行：OSM文件选择 和 文本文件选择
         # OSM文件选择
-        self.osm_label = QLabel(tr("files.osm_file") + ":")
+        self.osm_label = QLabel(t["files.osm_file"] + ":")
         self.osm_path_edit = QLineEdit()
-        self.browse_osm_btn = QPushButton(tr("buttons.browse_ellipsis"))
+        self.browse_osm_btn = QPushButton(t["buttons.browse_ellipsis"])
         self.browse_osm_btn.clicked.connect(self.browse_osm)
 
         osm_path_layout = QHBoxLayout()
@@ -126,9 +253,9 @@ class TextTab(QWidget):
         input_layout.addLayout(osm_path_layout, 1, 1)
 
         # 文本文件选择（仅匹配模式使用）
-        self.text_label = QLabel(tr("files.text_file") + ":")
+        self.text_label = QLabel(t["files.text_file"] + ":")
         self.text_path_edit = QLineEdit()
-        self.browse_text_btn = QPushButton(tr("buttons.browse_ellipsis"))
+        self.browse_text_btn = QPushButton(t["buttons.browse_ellipsis"])
         self.browse_text_btn.clicked.connect(self.browse_text)
 
         text_path_layout = QHBoxLayout()
@@ -140,9 +267,9 @@ class TextTab(QWidget):
 
         # 第三行：输出文件路径 和 配置文件选择
         # 输出文件路径
-        self.output_label = QLabel(tr("files.output_file") + ":")
+        self.output_label = QLabel(t["files.output_file"] + ":")
         self.output_path_edit = QLineEdit()
-        self.browse_output_btn = QPushButton(tr("buttons.browse_ellipsis"))
+        self.browse_output_btn = QPushButton(t["buttons.browse_ellipsis"])
         self.browse_output_btn.clicked.connect(self.browse_output)
 
         output_path_layout = QHBoxLayout()
@@ -153,9 +280,9 @@ class TextTab(QWidget):
         input_layout.addLayout(output_path_layout, 2, 1)
 
         # 配置文件选择
-        self.config_label = QLabel(tr("files.config_file_optional") + ":")
+        self.config_label = QLabel(t["files.config_file_optional"] + ":")
         self.config_path_edit = QLineEdit()
-        self.browse_config_btn = QPushButton(tr("buttons.browse_ellipsis"))
+        self.browse_config_btn = QPushButton(t["buttons.browse_ellipsis"])
         self.browse_config_btn.clicked.connect(self.browse_config)
 
         config_path_layout = QHBoxLayout()
@@ -173,19 +300,19 @@ class TextTab(QWidget):
         main_layout.addWidget(self.input_group)
 
         # 创建参数设置区域
-        self.params_group = QGroupBox(tr("ui.parameter_settings"))
+        self.params_group = QGroupBox(t["ui.parameter_settings"])
         params_layout = QFormLayout()
 
         # 文本图层名称
         self.layer_name_edit = QLineEdit("——平面——文字")
-        self.layer_name_label = QLabel(tr("params.layer_name") + ":")
+        self.layer_name_label = QLabel(t["params.layer_name"] + ":")
         params_layout.addRow(self.layer_name_label, self.layer_name_edit)
 
         # 附近匹配偏移阈值
         self.nearby_threshold_spin = QSpinBox()
         self.nearby_threshold_spin.setRange(1, 500)
         self.nearby_threshold_spin.setValue(50)
-        self.nearby_threshold_label = QLabel(tr("params.nearby_threshold") + ":")
+        self.nearby_threshold_label = QLabel(t["params.nearby_threshold"] + ":")
         params_layout.addRow(self.nearby_threshold_label, self.nearby_threshold_spin)
 
         # 中心偏移比例阈值
@@ -193,54 +320,62 @@ class TextTab(QWidget):
         self.center_distance_ratio_spin.setRange(0.1, 1.0)
         self.center_distance_ratio_spin.setValue(0.7)
         self.center_distance_ratio_spin.setSingleStep(0.1)
-        self.center_distance_ratio_label = QLabel(tr("params.center_distance_ratio") + ":")
+        self.center_distance_ratio_label = QLabel(t["params.center_distance_ratio"] + ":")
         params_layout.addRow(self.center_distance_ratio_label, self.center_distance_ratio_spin)
 
         # 可视化选项
-        self.visualize_check = QCheckBox(tr("params.visualize"))
+        self.visualize_check = QCheckBox(t["params.visualize"])
         params_layout.addRow("", self.visualize_check)
 
         self.params_group.setLayout(params_layout)
         main_layout.addWidget(self.params_group)
 
         # 创建文本过滤区域
-        self.filter_group = QGroupBox(tr("ui.filter_settings"))
+        self.filter_group = QGroupBox(t["ui.filter_settings"])
         filter_layout = QVBoxLayout()
 
-        self.filter_description_label = QLabel(tr("rules.filter_text_description"))
+        self.filter_description_label = QLabel(t["rules.filter_text_description"])
         filter_layout.addWidget(self.filter_description_label)
         self.filter_text_edit = QTextEdit()
-        self.filter_text_edit.setPlaceholderText(tr("hints.filter_text_placeholder"))
+        self.filter_text_edit.setPlaceholderText(t["hints.filter_text_placeholder"])
         filter_layout.addWidget(self.filter_text_edit)
 
+        # 过滤文本在停止编辑后解析一次，开始处理时直接使用解析结果
+        self._filter_text_list = []
+        self._filter_parse_timer = QTimer(self)
+        self._filter_parse_timer.setSingleShot(True)
+        self._filter_parse_timer.setInterval(FILTER_PARSE_DELAY_MS)
+        self._filter_parse_timer.timeout.connect(self._parse_filter_text)
+        self.filter_text_edit.textChanged.connect(self._filter_parse_timer.start)
+
         self.filter_group.setLayout(filter_layout)
         main_layout.addWidget(self.filter_group)
 
         # 创建进度显示区域
-        self.progress_group = QGroupBox(tr("ui.progress_display"))
+        self.progress_group = QGroupBox(t["ui.progress_display"])
         progress_layout = QVBoxLayout()
 
         # 总体进度条
-        self.overall_progress_label = QLabel(tr("progress.overall") + ":")
+        self.overall_progress_label = QLabel(t["progress.overall"] + ":")
         progress_layout.addWidget(self.overall_progress_label)
         self.total_progress_bar = QProgressBar()
         progress_layout.addWidget(self.total_progress_bar)
 
         # 当前步骤进度条
-        self.current_step_label = QLabel(tr("progress.current_step") + ":")
+        self.current_step_label = QLabel(t["progress.current_step"] + ":")
         progress_layout.addWidget(self.current_step_label)
         self.step_progress_bar = QProgressBar()
         progress_layout.addWidget(self.step_progress_bar)
 
         # 处理状态文本
-        self.status_label = QLabel(tr("status.ready"))
+        self.status_label = QLabel(t["status.ready"])
         progress_layout.addWidget(self.status_label)
 
         self.progress_group.setLayout(progress_layout)
         main_layout.addWidget(self.progress_group)
 
         # 创建结果预览区域
-        self.preview_group = QGroupBox(tr("ui.result_preview"))
+        self.preview_group = QGroupBox(t["ui.result_preview"])
         preview_layout = QVBoxLayout()
 
         self.preview_label = QLabel()
@@ -248,7 +383,7 @@ class TextTab(QWidget):
         self.preview_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.preview_label.setMinimumHeight(200)
         self.preview_label.setStyleSheet("background-color: white; border: 1px solid #cccccc;")
-        self.preview_label.setText(tr("hints.preview_placeholder"))
+        self.preview_label.setText(t["hints.preview_placeholder"])
 
         # 创建滚动区域
         scroll_area = QScrollArea()
@@ -263,10 +398,10 @@ class TextTab(QWidget):
         # 创建按钮区域
         button_layout = QHBoxLayout()
 
-        self.start_button = QPushButton(tr("buttons.start_processing"))
+        self.start_button = QPushButton(t["buttons.start_processing"])
         self.start_button.clicked.connect(self.start_processing)
 
-        self.cancel_button = QPushButton(tr("buttons.cancel"))
+        self.cancel_button = QPushButton(t["buttons.cancel"])
         self.cancel_button.clicked.connect(self.cancel_processing)
         self.cancel_button.setEnabled(False)
 
@@ -279,6 +414,15 @@ class TextTab(QWidget):
         # 连接信号
         self.mode_group.buttonClicked.connect(self.update_ui_for_mode)
 
+        # 各输入项对应的控件及其当前启用状态
+        self._input_widgets = {
+            'dxf': (self.dxf_path_edit, self.browse_dxf_btn),
+            'bounds': (self.bounds_path_edit, self.browse_bounds_btn),
+            'osm': (self.osm_path_edit, self.browse_osm_btn),
+            'text': (self.text_path_edit, self.browse_text_btn),
+        }
+        self._input_enabled = {}
+
         # 初始化UI状态
         self.update_ui_for_mode()
 
@@ -286,61 +430,46 @@ class TextTab(QWidget):
         """根据选择的模式更新UI状态"""
         mode = self.mode_group.checkedId()
 
-        # 完整流程模式
-        if mode == 1 or mode == 0:  # 0表示没有选中任何按钮
-            self.dxf_path_edit.setEnabled(True)
-            self.browse_dxf_btn.setEnabled(True)
-            self.bounds_path_edit.setEnabled(True)
-            self.browse_bounds_btn.setEnabled(True)
-            self.osm_path_edit.setEnabled(True)
-            self.browse_osm_btn.setEnabled(True)
-            self.text_path_edit.setEnabled(False)
-            self.browse_text_btn.setEnabled(False)
-        # 仅提取文本模式
-        elif mode == 2:
-            self.dxf_path_edit.setEnabled(True)
-            self.browse_dxf_btn.setEnabled(True)
-            self.bounds_path_edit.setEnabled(False)
-            self.browse_bounds_btn.setEnabled(False)
-            self.osm_path_edit.setEnabled(False)
-            self.browse_osm_btn.setEnabled(False)
-            self.text_path_edit.setEnabled(False)
-            self.browse_text_btn.setEnabled(False)
-        # 仅匹配文本模式
-        elif mode == 3:
-            self.dxf_path_edit.setEnabled(False)
-            self.browse_dxf_btn.setEnabled(False)
-            self.bounds_path_edit.setEnabled(True)
-            self.browse_bounds_btn.setEnabled(True)
-            self.osm_path_edit.setEnabled(True)
-            self.browse_osm_btn.setEnabled(True)
-            self.text_path_edit.setEnabled(True)
-            self.browse_text_btn.setEnabled(True)
+        # 0表示没有选中任何按钮，按完整流程模式处理
+        enabled_inputs = MODE_ENABLED_INPUTS.get(mode, MODE_ENABLED_INPUTS[1])
+
+        # 只更新启用状态发生变化的输入项
+        for name, enabled in enabled_inputs.items():
+            if self._input_enabled.get(name) != enabled:
+                for widget in self._input_widgets[name]:
+                    widget.setEnabled(enabled)
+                self._input_enabled[name] = enabled
 
     def browse_dxf(self):
         """浏览DXF文件"""
+        caption, file_filter = self._dialog_texts['dxf']
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "选择DXF文件", "", "DXF文件 (*.dxf)"
+            self, caption, self.settings.value("last_dir/text_dxf", "") or "", file_filter
         )
         if file_path:
+            self.settings.setValue("last_dir/text_dxf", os.path.dirname(file_path))
             self.dxf_path_edit.setText(file_path)
             # u81eau52a8u8bbeu7f6eu8f93u51fau6587u4ef6u8defu5f84
             self.suggest_paths(file_path)
 
     def browse_bounds(self):
         """浏览边界文件"""
+        caption, file_filter = self._dialog_texts['bounds']
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "选择边界文件", "", "JSON文件 (*.json)"
+            self, caption, self.settings.value("last_dir/text_bounds", "") or "", file_filter
         )
         if file_path:
+            self.settings.setValue("last_dir/text_bounds", os.path.dirname(file_path))
             self.bounds_path_edit.setText(file_path)
 
     def browse_osm(self):
         """浏览OSM文件"""
+        caption, file_filter = self._dialog_texts['osm']
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "选择OSM文件", "", "OSM文件 (*.osm)"
+            self, caption, self.settings.value("last_dir/text_osm", "") or "", file_filter
         )
         if file_path:
+            self.settings.setValue("last_dir/text_osm", os.path.dirname(file_path))
             self.osm_path_edit.setText(file_path)
             # u81eau52a8u8bbeu7f6eu8f93u51fau6587u4ef6u8defu5f84
             if not self.output_path_edit.text():
@@ -349,10 +478,12 @@ class TextTab(QWidget):
 
     def browse_text(self):
         """浏览文本文件"""
+        caption, file_filter = self._dialog_texts['text']
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "选择文本文件", "", "JSON文件 (*.json)"
+            self, caption, self.settings.value("last_dir/text_data", "") or "", file_filter
         )
         if file_path:
+            self.settings.setValue("last_dir/text_data", os.path.dirname(file_path))
             self.text_path_edit.setText(file_path)
 
     def browse_output(self):
@@ -360,47 +491,98 @@ class TextTab(QWidget):
         mode = self.mode_group.checkedId()
 
         if mode == 2:  # 仅提取文本模式
-            file_path, _ = QFileDialog.getSaveFileName(
-                self, "选择输出文件", "", "JSON文件 (*.json)"
-            )
+            caption, file_filter = self._dialog_texts['output_json']
         else:  # 其他模式
-            file_path, _ = QFileDialog.getSaveFileName(
-                self, "选择输出文件", "", "OSM文件 (*.osm)"
-            )
+            caption, file_filter = self._dialog_texts['output_osm']
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, caption, self.settings.value("last_dir/text_output", "") or "", file_filter
+        )
 
         if file_path:
+            self.settings.setValue("last_dir/text_output", os.path.dirname(file_path))
             self.output_path_edit.setText(file_path)
 
     def browse_config(self):
         """浏览配置文件"""
+        caption, file_filter = self._dialog_texts['config']
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "选择配置文件", "", "YAML文件 (*.yaml *.yml)"
+            self, caption, self.settings.value("last_dir/config", "") or "", file_filter
         )
         if file_path:
+            self.settings.setValue("last_dir/config", os.path.dirname(file_path))
             self.config_path_edit.setText(file_path)
 
     def suggest_paths(self, dxf_path):
-        """根据输入路径自动建议其他路径"""
+        """根据输入路径自动建议其他路径，文件查找在线程池中进行"""
+        self._suggest_dxf_path = dxf_path
+        # 保留任务引用，直到结果返回
+        self._suggest_worker = SuggestPathsWorker(dxf_path)
+        self._suggest_worker.signals.finished.connect(self._apply_suggested_paths)
+        QThreadPool.globalInstance().start(self._suggest_worker)
+
+    @pyqtSlot(str, dict)
+    def _apply_suggested_paths(self, dxf_path, paths):
+        """在界面线程中填入建议的路径"""
+        # 查找期间用户又选择了其他文件时，丢弃旧的结果
+        if dxf_path != self._suggest_dxf_path:
+            return
+        self._suggest_worker = None
+
+        if 'bounds' in paths:
+            self.bounds_path_edit.setText(paths['bounds'])
+        if 'osm' in paths:
+            self.osm_path_edit.setText(paths['osm'])
+            self.output_path_edit.setText(paths['output'])
+
+    @classmethod
+    def find_suggested_paths(cls, dxf_path):
+        """
+        查找与DXF文件对应的边界文件、OSM文件和输出文件路径
+
+        只访问文件系统，不操作界面，可以在工作线程中调用。
+        返回的字典只包含找到的项：'bounds'、'osm'和'output'。
+        """
         dxf_dir = Path(dxf_path).parent
         file_stem = Path(dxf_path).stem
+        paths = {}
 
         # 尝试找到bounds.json
         bounds_path = dxf_dir.parent / 'bounds' / 'bounds.json'
         if bounds_path.exists():
-            self.bounds_path_edit.setText(str(bounds_path))
+            paths['bounds'] = str(bounds_path)
 
-        # 尝试找到OSM文件
+        # 尝试找到OSM文件，只遍历一次目录并在第一个匹配处停止
         osm_dir = dxf_dir.parent / 'osm' / 'original'
-        if osm_dir.exists():
-            osm_files = list(osm_dir.glob(f"{file_stem}*.osm"))
-            if osm_files:
-                self.osm_path_edit.setText(str(osm_files[0]))
-
-                # 设置输出文件路径
-                output_dir = dxf_dir.parent / 'osm' / 'texted'
-                output_dir.mkdir(parents=True, exist_ok=True)
-                output_path = output_dir / f"{osm_files[0].stem}_texted.osm"
-                self.output_path_edit.setText(str(output_path))
+        osm_file = cls._find_osm_file(osm_dir, file_stem)
+        if osm_file is not None:
+            paths['osm'] = str(osm_file)
+
+            # 设置输出文件路径，输出目录由处理线程在开始处理时创建
+            output_dir = dxf_dir.parent / 'osm' / 'texted'
+            paths['output'] = str(output_dir / f"{osm_file.stem}_texted.osm")
+
+        return paths
+
+    @staticmethod
+    def _find_osm_file(osm_dir, file_stem):
+        """返回目录中第一个以file_stem开头的OSM文件，目录不存在或没有匹配时返回None"""
+        # 与glob一致，在不区分大小写的系统上按不区分大小写比较
+        prefix = os.path.normcase(file_stem)
+        suffix = os.path.normcase('.osm')
+        try:
+            with os.scandir(osm_dir) as entries:
+                for entry in entries:
+                    name = os.path.normcase(entry.name)
+                    if name.startswith(prefix) and name.endswith(suffix):
+                        return Path(entry.path)
+        except OSError:
+            pass
+        return None
+
+    def _parse_filter_text(self):
+        """解析过滤文本框内容，每行一个过滤文本"""
+        filter_text = self.filter_text_edit.toPlainText().strip()
+        self._filter_text_list = [text.strip() for text in filter_text.split('\n') if text.strip()]
 
     def start_processing(self):
         """开始处理"""
@@ -413,8 +595,9 @@ class TextTab(QWidget):
             QMessageBox.warning(self, "输入错误", "请选择输出文件路径")
             return
 
-        # 确保输出目录存在
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        # 新一轮处理可能覆盖同名的预览文件，清除预览标识和缓存以便重新加载
+        self._preview_key = None
+        self._preview_cache.clear()
 
         # 获取通用参数
         config_path = self.config_path_edit.text().strip() or None
@@ -423,9 +606,11 @@ class TextTab(QWidget):
         center_distance_ratio = self.center_distance_ratio_spin.value()
         visualize = self.visualize_check.isChecked()
 
-        # 获取过滤文本列表
-        filter_text = self.filter_text_edit.toPlainText().strip()
-        filter_text_list = [text.strip() for text in filter_text.split('\n') if text.strip()]
+        # 获取过滤文本列表，若有尚未解析的修改则立即解析
+        if self._filter_parse_timer.isActive():
+            self._filter_parse_timer.stop()
+            self._parse_filter_text()
+        filter_text_list = self._filter_text_list
 
         # 根据不同模式验证输入并调用相应功能
         if mode == 1 or mode == 0:  # 完整流程模式
@@ -456,7 +641,7 @@ class TextTab(QWidget):
             self.step_progress_bar.setValue(0)
 
             # 调用文本提取模块
-            self.log_message.emit(f"开始完整文本提取流程...\n输入DXF: {dxf_path}\n边界文件: {bounds_path}\n输入OSM: {osm_path}\n输出: {output_path}")
+            self.forward_log_message(f"开始完整文本提取流程...\n输入DXF: {dxf_path}\n边界文件: {bounds_path}\n输入OSM: {osm_path}\n输出: {output_path}")
 
             # 启动处理线程
             self.text_module.start_full_process(
@@ -492,7 +677,7 @@ class TextTab(QWidget):
             self.step_progress_bar.setValue(0)
 
             # 调用文本提取模块
-            self.log_message.emit(f"开始提取文本...\n输入DXF: {dxf_path}\n输出: {output_path}")
+            self.forward_log_message(f"开始提取文本...\n输入DXF: {dxf_path}\n输出: {output_path}")
 
             # 启动处理线程
             self.text_module.start_extract_only(
@@ -533,7 +718,7 @@ class TextTab(QWidget):
             self.step_progress_bar.setValue(0)
 
             # 调用文本提取模块
-            self.log_message.emit(f"开始匹配文本...\n边界文件: {bounds_path}\n输入OSM: {osm_path}\n文本文件: {text_path}\n输出: {output_path}")
+            self.forward_log_message(f"开始匹配文本...\n边界文件: {bounds_path}\n输入OSM: {osm_path}\n文本文件: {text_path}\n输出: {output_path}")
 
             # 启动处理线程
             self.text_module.start_match_only(
@@ -552,8 +737,15 @@ class TextTab(QWidget):
 
     def cancel_processing(self):
         """取消处理"""
-        # 调用文本提取模块的取消方法
-        self.text_module.cancel_processing()
+        # 调用文本提取模块的取消方法，模块尚未创建时没有需要取消的任务
+        if self._text_module is not None:
+            self._text_module.cancel_processing()
+
+        # 丢弃尚未刷新的进度和预览，避免覆盖取消状态
+        self._pending_total = None
+        self._pending_step = None
+        self._pending_status = None
+        self._pending_preview = None
 
         # 更新UI状态
         self.status_label.setText("已取消")
@@ -561,88 +753,168 @@ class TextTab(QWidget):
         self.cancel_button.setEnabled(False)
 
         # 记录日志
-        self.log_message.emit("文本提取已取消")
-
+        self.forward_log_message("文本提取已取消")
+        self._flush_logs()
+
+    @pyqtSlot(str)
+    def forward_log_message(self, message):
+        """缓存日志消息，定时批量转发到主窗口"""
+        self._log_buffer.append(message)
+        if len(self._log_buffer) >= LOG_BUFFER_LIMIT:
+            self._flush_logs()
+        elif not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+
+    def _flush_logs(self):
+        """将缓存的日志合并为一条消息转发到主窗口"""
+        self._log_flush_timer.stop()
+        if self._log_buffer:
+            self.log_message.emit("\n".join(self._log_buffer))
+            self._log_buffer.clear()
+
+    @pyqtSlot(int, str)
     def update_progress_signal(self, progress, status=None):
-        """更新总体进度（信号连接用）"""
-        # 处理不同类型的进度值
-        if isinstance(progress, (int, float)):
-            if progress <= 1.0:
-                # 如果是0-1范围，转换为0-100
-                progress_value = int(progress * 100)
-            else:
-                # 如果已经是0-100范围
-                progress_value = int(progress)
-        else:
-            progress_value = 0
-
-        # 更新总体进度条
-        self.total_progress_bar.setValue(progress_value)
-
-        # 更新状态文本
+        """更新总体进度（信号连接用），progress为TextModule发出的0-100整数百分比"""
+        # 暂存总体进度和状态文本，由_flush_progress统一刷新
+        self._pending_total = progress
         if status is not None:
-            self.status_label.setText(status)
+            self._pending_status = status
+        self._progress_throttle.request()
 
+    @pyqtSlot(int, str)
     def update_step_progress_signal(self, progress, status=None):
-        """更新步骤进度（信号连接用）"""
-        # 处理不同类型的进度值
-        if isinstance(progress, (int, float)):
-            if progress <= 1.0:
-                # 如果是0-1范围，转换为0-100
-                progress_value = int(progress * 100)
-            else:
-                # 如果已经是0-100范围
-                progress_value = int(progress)
-        else:
-            progress_value = 0
-
-        # 更新当前步骤进度条
-        self.step_progress_bar.setValue(progress_value)
-
-        # 更新状态文本
+        """更新步骤进度（信号连接用），progress为TextModule发出的0-100整数百分比"""
+        # 暂存当前步骤进度和状态文本，由_flush_progress统一刷新
+        self._pending_step = progress
         if status is not None:
-            self.status_label.setText(f"正在处理: {status}")
+            self._pending_status = f"正在处理: {status}"
+        self._progress_throttle.request()
 
     def update_progress(self, total_progress, step_progress=None, status=None, preview_image=None):
         """更新进度和状态"""
-        # 更新总体进度条
-        self.total_progress_bar.setValue(int(total_progress * 100))
-
-        # 更新当前步骤进度条
+        # 暂存进度和状态文本，由_flush_progress统一刷新
+        self._pending_total = int(total_progress * 100)
         if step_progress is not None:
-            self.step_progress_bar.setValue(int(step_progress * 100))
-
-        # 更新状态文本
+            self._pending_step = int(step_progress * 100)
         if status is not None:
-            self.status_label.setText(status)
-
-        # 更新预览图像
+            self._pending_status = status
+        # 预览图像同样只保留最新一张，刷新时才解码
         if preview_image is not None:
-            # 将图像数据转换为QImage
-            if isinstance(preview_image, bytes):
-                qimg = QImage.fromData(preview_image)
-                pixmap = QPixmap.fromImage(qimg)
-                self.preview_label.setPixmap(pixmap.scaled(
-                    self.preview_label.width(),
-                    self.preview_label.height(),
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                ))
-            elif isinstance(preview_image, str) and os.path.exists(preview_image):
-                # 如果是文件路径，加载图像
-                pixmap = QPixmap(preview_image)
-                self.preview_label.setPixmap(pixmap.scaled(
-                    self.preview_label.width(),
-                    self.preview_label.height(),
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                ))
-            else:
-                # 清除预览
+            self._pending_preview = preview_image
+        self._progress_throttle.request()
+
+    def _show_preview(self, preview_image, smooth=False):
+        """
+        显示预览图像，最近显示过的图像在预览区尺寸不变时不重复解码和缩放
+
+        处理过程中的预览很快会被下一张替换，使用快速缩放；
+        smooth为True时（最终结果）使用平滑缩放。
+        """
+        # 计算图像标识：字节数据用哈希值，文件路径直接用路径，
+        # 文件是否存在由解码结果判断，不再单独stat
+        if isinstance(preview_image, bytes):
+            image_key = hash(preview_image)
+        elif isinstance(preview_image, str):
+            image_key = preview_image
+        else:
+            image_key = None
+
+        if image_key is None:
+            # 清除预览
+            self._preview_key = None
+            self.preview_label.setText("无法显示预览")
+            return
+
+        width = self.preview_label.width()
+        height = self.preview_label.height()
+        preview_key = (image_key, width, height, smooth)
+        if preview_key == self._preview_key:
+            return
+
+        # 最近显示过的预览直接复用，否则解码并放入缓存
+        pixmap = self._preview_cache.get(preview_key)
+        if pixmap is not None:
+            self._preview_cache.move_to_end(preview_key)
+        else:
+            pixmap = self._load_preview_pixmap(preview_image, width, height, smooth)
+            if pixmap is None:
+                # 图像无法解码，清除预览
+                self._preview_key = None
                 self.preview_label.setText("无法显示预览")
+                return
+            self._preview_cache[preview_key] = pixmap
+            if len(self._preview_cache) > PREVIEW_CACHE_SIZE:
+                self._preview_cache.popitem(last=False)
+
+        self._preview_key = preview_key
+        self.preview_label.setPixmap(pixmap)
+
+    def _load_preview_pixmap(self, preview_image, width, height, smooth):
+        """按预览区尺寸解码预览图像，无法解码时返回None"""
+        if isinstance(preview_image, bytes):
+            buffer = QBuffer()
+            buffer.setData(preview_image)
+            buffer.open(QIODevice.ReadOnly)
+            reader = QImageReader(buffer)
+        else:
+            reader = QImageReader(preview_image)
 
+        # 解码器支持按尺寸解码时（如JPEG）直接解码为预览尺寸，避免先解码出全分辨率图像；
+        # 其他格式由QImageReader解码后平滑缩放，中间预览改为解码后自行快速缩放
+        image_size = reader.size()
+        scale_in_reader = image_size.isValid() and (
+            smooth or reader.supportsOption(QImageIOHandler.ScaledSize)
+        )
+        if scale_in_reader:
+            reader.setScaledSize(image_size.scaled(width, height, Qt.KeepAspectRatio))
+        if not smooth:
+            # JPEG解码器在质量低于50时使用快速解码和缩放
+            reader.setQuality(25)
+        image = reader.read()
+
+        if image.isNull():
+            return None
+
+        if not scale_in_reader:
+            image = image.scaled(
+                width,
+                height,
+                Qt.KeepAspectRatio,
+                Qt.SmoothTransformation if smooth else Qt.FastTransformation
+            )
+
+        return QPixmap.fromImage(image)
+
+    @pyqtSlot(str)
+    def show_visualization(self, image_path):
+        """显示处理完成后生成的可视化图像"""
+        # 最终结果优先，丢弃尚未显示的中间预览
+        self._pending_preview = None
+        self._show_preview(image_path, smooth=True)
+
+    def _flush_progress(self):
+        """将暂存的进度写入进度条和状态文本"""
+        # 只写入发生变化的值
+        if self._pending_total is not None and self.total_progress_bar.value() != self._pending_total:
+            self.total_progress_bar.setValue(self._pending_total)
+        if self._pending_step is not None and self.step_progress_bar.value() != self._pending_step:
+            self.step_progress_bar.setValue(self._pending_step)
+        if self._pending_status is not None and self.status_label.text() != self._pending_status:
+            self.status_label.setText(self._pending_status)
+        if self._pending_preview is not None:
+            self._show_preview(self._pending_preview)
+
+        self._pending_total = None
+        self._pending_step = None
+        self._pending_status = None
+        self._pending_preview = None
+
+    @pyqtSlot(bool, str)
     def processing_completed(self, success, message):
         """处理完成回调"""
+        # 先刷新暂存的进度，避免其覆盖最终状态
+        self._progress_throttle.flush()
+
         # 更新UI状态
         self.start_button.setEnabled(True)
         self.cancel_button.setEnabled(False)
@@ -652,7 +924,8 @@ class TextTab(QWidget):
             self.status_label.setText("完成")
             self.total_progress_bar.setValue(100)
             self.step_progress_bar.setValue(100)
-            self.log_message.emit(f"文本提取完成: {message}")
+            self.forward_log_message(f"文本提取完成: {message}")
+            self._flush_logs()
 
             # 显示完成消息弹窗
             mode = self.mode_group.checkedId()
@@ -668,54 +941,71 @@ class TextTab(QWidget):
         else:
             # 处理失败
             self.status_label.setText("失败")
-            self.log_message.emit(f"文本提取失败: {message}")
+            self.forward_log_message(f"文本提取失败: {message}")
+            self._flush_logs()
             QMessageBox.warning(self, "处理失败", f"文本提取过程中出现错误:\n\n{message}")
 
+    def _translations(self):
+        """返回本页用到的全部翻译文本，每个键只查询一次"""
+        return {key: tr(key) for key in TRANSLATION_KEYS}
+
+    def _build_dialog_texts(self):
+        """返回各文件对话框翻译后的标题和过滤器"""
+        return {
+            kind: (tr(*caption), tr(*file_filter))
+            for kind, (caption, file_filter) in FILE_DIALOG_TEXTS.items()
+        }
+
     def on_language_changed(self):
         """响应语言切换事件"""
+        # 一次性获取本页用到的全部翻译文本
+        t = self._translations()
+        self._dialog_texts = self._build_dialog_texts()
+
         # 更新组框标题
-        self.mode_group_box.setTitle(tr("ui.processing_mode"))
-        self.input_group.setTitle(tr("ui.input_settings"))
-        self.params_group.setTitle(tr("ui.parameter_settings"))
-        self.filter_group.setTitle(tr("ui.filter_settings"))
-        self.progress_group.setTitle(tr("ui.progress_display"))
-        self.preview_group.setTitle(tr("ui.result_preview"))
+        self.mode_group_box.setTitle(t["ui.processing_mode"])
+        self.input_group.setTitle(t["ui.input_settings"])
+        self.params_group.setTitle(t["ui.parameter_settings"])
+        self.filter_group.setTitle(t["ui.filter_settings"])
+        self.progress_group.setTitle(t["ui.progress_display"])
+        self.preview_group.setTitle(t["ui.result_preview"])
 
         # 更新模式选择按钮
-        self.full_mode_radio.setText(tr("modes.full_process"))
-        self.extract_only_radio.setText(tr("modes.extract_only"))
-        self.match_only_radio.setText(tr("modes.match_only"))
+        self.full_mode_radio.setText(t["modes.full_process"])
+        self.extract_only_radio.setText(t["modes.extract_only"])
+        self.match_only_radio.setText(t["modes.match_only"])
 
         # 更新文件标签
-        self.dxf_label.setText(tr("files.dxf_file") + ":")
-        self.bounds_label.setText(tr("files.bounds_file") + ":")
-        self.osm_label.setText(tr("files.osm_file") + ":")
-        self.text_label.setText(tr("files.text_file") + ":")
-        self.output_label.setText(tr("files.output_file") + ":")
-        self.config_label.setText(tr("files.config_file_optional") + ":")
+        self.dxf_label.setText(t["files.dxf_file"] + ":")
+        self.bounds_label.setText(t["files.bounds_file"] + ":")
+        self.osm_label.setText(t["files.osm_file"] + ":")
+        self.text_label.setText(t["files.text_file"] + ":")
+        self.output_label.setText(t["files.output_file"] + ":")
+        self.config_label.setText(t["files.config_file_optional"] + ":")
 
         # 更新参数标签
-        self.layer_name_label.setText(tr("params.layer_name") + ":")
-        self.nearby_threshold_label.setText(tr("params.nearby_threshold") + ":")
-        self.center_distance_ratio_label.setText(tr("params.center_distance_ratio") + ":")
-        self.visualize_check.setText(tr("params.visualize"))
+        self.layer_name_label.setText(t["params.layer_name"] + ":")
+        self.nearby_threshold_label.setText(t["params.nearby_threshold"] + ":")
+        self.center_distance_ratio_label.setText(t["params.center_distance_ratio"] + ":")
+        self.visualize_check.setText(t["params.visualize"])
 
         # 更新进度标签
-        self.overall_progress_label.setText(tr("progress.overall") + ":")
-        self.current_step_label.setText(tr("progress.current_step") + ":")
-        self.status_label.setText(tr("status.ready"))
+        self.overall_progress_label.setText(t["progress.overall"] + ":")
+        self.current_step_label.setText(t["progress.current_step"] + ":")
+        self.status_label.setText(t["status.ready"])
 
         # 更新按钮文本
-        self.browse_dxf_btn.setText(tr("buttons.browse_ellipsis"))
-        self.browse_bounds_btn.setText(tr("buttons.browse_ellipsis"))
-        self.browse_osm_btn.setText(tr("buttons.browse_ellipsis"))
-        self.browse_text_btn.setText(tr("buttons.browse_ellipsis"))
-        self.browse_output_btn.setText(tr("buttons.browse_ellipsis"))
-        self.browse_config_btn.setText(tr("buttons.browse_ellipsis"))
-        self.start_button.setText(tr("buttons.start_processing"))
-        self.cancel_button.setText(tr("buttons.cancel"))
+        self.browse_dxf_btn.setText(t["buttons.browse_ellipsis"])
+        self.browse_bounds_btn.setText(t["buttons.browse_ellipsis"])
+        self.browse_osm_btn.setText(t["buttons.browse_ellipsis"])
+        self.browse_text_btn.setText(t["buttons.browse_ellipsis"])
+        self.browse_output_btn.setText(t["buttons.browse_ellipsis"])
+        self.browse_config_btn.setText(t["buttons.browse_ellipsis"])
+        self.start_button.setText(t["buttons.start_processing"])
+        self.cancel_button.setText(t["buttons.cancel"])
 
         # 更新其他文本
-        self.filter_description_label.setText(tr("rules.filter_text_description"))
-        self.filter_text_edit.setPlaceholderText(tr("hints.filter_text_placeholder"))
-        self.preview_label.setText(tr("hints.preview_placeholder"))
+        self.filter_description_label.setText(t["rules.filter_text_description"])
+        self.filter_text_edit.setPlaceholderText(t["hints.filter_text_placeholder"])
+        self._preview_key = None
+        self.preview_label.setText(t["hints.preview_placeholder"])
@@ -7,10 +7,18 @@
 """
 
 import os
+import sys
+import threading
 import yaml
 from pathlib import Path
 from PyQt5.QtCore import QObject, pyqtSignal
 
+# 优先使用基于libyaml的C实现解析YAML，不可用时回退到纯Python实现
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 
 class LanguageManager(QObject):
     """语言管理器，负责处理国际化相关功能"""
@@ -20,41 +28,58 @@ class LanguageManager(QObject):
     
     _instance = None
     _initialized = False
+    _lock = threading.Lock()
     
     def __new__(cls):
-        """单例模式实现"""
+        """单例模式实现，加锁避免多个线程同时创建实例"""
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
         return cls._instance
     
     def __init__(self):
         """初始化语言管理器"""
+        # 已初始化时直接返回，不再重复调用QObject.__init__
         if self._initialized:
             return
-            
-        super().__init__()
-        
-        # 获取i18n目录路径
-        self.i18n_dir = Path(__file__).parent.parent / "i18n"
-        
-        # 支持的语言列表
-        self.supported_languages = {
-            "zh_CN": "中文",
-            "en_US": "English"
-        }
-        
-        # 当前语言和语言包
-        self.current_language = "zh_CN"
-        self.language_data = {}
-        
-        # 默认语言包（中文）
-        self.default_language = "zh_CN"
-        
-        # 标记为已初始化
-        self._initialized = True
         
-        # 加载默认语言
-        self.load_language(self.current_language)
+        with self._lock:
+            if self._initialized:
+                return
+            
+            super().__init__()
+            
+            # 获取i18n目录路径
+            self.i18n_dir = Path(__file__).parent.parent / "i18n"
+            
+            # 支持的语言列表
+            self.supported_languages = {
+                "zh_CN": "中文",
+                "en_US": "English"
+            }
+            
+            # 当前语言和语言包
+            self.current_language = "zh_CN"
+            self.language_data = {}
+            
+            # 当前语言展开后的翻译表，键为点分隔的键路径，如 "app.title"
+            self._translations = {}
+            
+            # 已解析的语言包缓存，值为(语言数据, 翻译表)，切换回已加载过的语言时不再重新解析YAML
+            self._language_cache = {}
+            
+            # 默认语言包（中文）
+            self.default_language = "zh_CN"
+            
+            # 加载默认语言
+            self.load_language(self.current_language)
+            
+            # 支持的语言只有少数几种，启动时一并解析，切换语言时无需再读取文件
+            self.preload_languages()
+            
+            # 全部属性就绪后才标记为已初始化，其他线程不会拿到未初始化完的实例
+            self._initialized = True
     
     def get_supported_languages(self):
         """获取支持的语言列表"""
@@ -67,16 +92,20 @@ class LanguageManager(QObject):
     def load_language(self, language_code):
         """加载指定语言包"""
         try:
+            # 已加载过的语言包直接复用
+            cached = self._language_cache.get(language_code)
+            if cached is not None:
+                self.language_data, self._translations = cached
+                self.current_language = language_code
+                return True
+            
             language_file = self.i18n_dir / f"{language_code}.yaml"
             
             if not language_file.exists():
                 print(f"Warning: Language file {language_file} not found, using default language")
                 language_code = self.default_language
-                language_file = self.i18n_dir / f"{language_code}.yaml"
-            
-            with open(language_file, 'r', encoding='utf-8') as f:
-                self.language_data = yaml.safe_load(f)
             
+            self.language_data, self._translations = self._load_language_pack(language_code)
             self.current_language = language_code
             return True
             
@@ -87,6 +116,34 @@ class LanguageManager(QObject):
                 return self.load_language(self.default_language)
             return False
     
+    def preload_languages(self):
+        """预先解析全部支持的语言包，缺失或无法解析的语言包留到切换时按原逻辑处理"""
+        for language_code in self.supported_languages:
+            if language_code in self._language_cache:
+                continue
+            if not (self.i18n_dir / f"{language_code}.yaml").exists():
+                continue
+            try:
+                self._load_language_pack(language_code)
+            except Exception as e:
+                print(f"Error preloading language file: {e}")
+    
+    def _load_language_pack(self, language_code):
+        """解析语言包并放入缓存，返回(语言数据, 翻译表)"""
+        cached = self._language_cache.get(language_code)
+        if cached is not None:
+            return cached
+        
+        language_file = self.i18n_dir / f"{language_code}.yaml"
+        with open(language_file, 'r', encoding='utf-8') as f:
+            language_data = yaml.load(f, Loader=SafeLoader)
+        
+        # 加载时一次性展开嵌套的语言数据，翻译时只需一次字典查找
+        translations = {}
+        self._flatten(language_data, "", translations)
+        cached = self._language_cache[language_code] = (language_data, translations)
+        return cached
+    
     def switch_language(self, language_code):
         """切换语言"""
         if language_code not in self.supported_languages:
@@ -115,29 +172,31 @@ class LanguageManager(QObject):
             翻译后的文本
         """
         try:
-            # 分割键路径
-            keys = key_path.split('.')
-            
-            # 在语言数据中查找翻译
-            current_data = self.language_data
-            for key in keys:
-                if isinstance(current_data, dict) and key in current_data:
-                    current_data = current_data[key]
-                else:
-                    # 如果找不到翻译，返回默认文本或键路径
-                    return default_text if default_text is not None else key_path
-            
-            # 如果找到的是列表，返回第一个元素或整个列表
-            if isinstance(current_data, list):
-                return current_data
-            elif isinstance(current_data, str):
-                return current_data
-            else:
-                return default_text if default_text is not None else key_path
-                
+            value = self._translations.get(key_path)
         except Exception as e:
             print(f"Translation error for key '{key_path}': {e}")
+            value = None
+        
+        # 如果找不到翻译，返回默认文本或键路径
+        if value is None:
             return default_text if default_text is not None else key_path
+        return value
+    
+    @staticmethod
+    def _flatten(data, prefix, translations):
+        """将嵌套的语言数据展开到translations中，只保留文本和列表"""
+        if not isinstance(data, dict):
+            return
+        for key, value in data.items():
+            # 键路径按"."分割后逐级匹配字符串键，非字符串键无法被查到
+            if not isinstance(key, str):
+                continue
+            key_path = prefix + key
+            if isinstance(value, dict):
+                LanguageManager._flatten(value, key_path + ".", translations)
+            elif isinstance(value, (str, list)):
+                # 驻留键字符串，与调用方传入的同值驻留字符串比较时可直接按对象比较
+                translations[sys.intern(key_path)] = value
     
     def tr_list(self, key_path, default_list=None):
         """
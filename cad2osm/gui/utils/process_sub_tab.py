@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CAD预处理子标签页的公共功能
+
+完整流程和半自动流程子标签页共用的方法，避免两份相同的实现各自演变。
+"""
+
+import weakref
+
+from PyQt5.QtCore import pyqtSlot
+from PyQt5.QtWidgets import QWidget, QMessageBox
+
+# 导入进度刷新节流
+from utils.progress_throttle import ProgressThrottle
+
+
+class ProcessSubTabMixin:
+    """
+    CAD预处理子标签页的公共方法，与QWidget一起继承，
+    并在__init__中设置process_module后调用init_process_sub_tab
+    """
+
+    def init_process_sub_tab(self, process_tab):
+        """
+        初始化公共状态
+
+        参数:
+            process_tab: 所属的ProcessTab，可为None，首次使用时再在顶层窗口中查找
+        """
+        # 保存所属ProcessTab的弱引用，用于登记当前正在运行的标签页，
+        # 避免子标签页与父标签页之间形成引用循环
+        self._process_tab_ref = weakref.ref(process_tab) if process_tab is not None else None
+
+        # 处理结果对话框，按图标类型缓存复用
+        self._result_boxes = {}
+
+        # 取消后正在等待旧工作线程退出
+        self._waiting_cancelled_worker = False
+        self.process_module.cancel_finished.connect(self._on_cancel_finished)
+
+        # 暂存的进度，由_flush_progress统一刷新
+        self._pending_total = None
+        self._pending_step = None
+        self._pending_status = None
+        self._progress_throttle = ProgressThrottle(self._flush_progress, self)
+
+    def get_process_tab(self):
+        """返回所属的ProcessTab，构造时未传入则在顶层窗口中查找一次"""
+        process_tab = self._process_tab_ref() if self._process_tab_ref is not None else None
+        if process_tab is None:
+            process_tab = self.window().findChild(QWidget, "process_tab")
+            if process_tab is not None:
+                self._process_tab_ref = weakref.ref(process_tab)
+        return process_tab
+
+    def show_result_message(self, icon, title, text):
+        """显示处理结果对话框，每种图标的对话框在首次使用时创建，之后复用"""
+        box = self._result_boxes.get(icon)
+        if box is None:
+            box = QMessageBox(icon, title, text, QMessageBox.Ok, self)
+            self._result_boxes[icon] = box
+        else:
+            box.setWindowTitle(title)
+            box.setText(text)
+        box.exec_()
+
+    @pyqtSlot(int, str)
+    def update_progress(self, progress, status=None):
+        """更新进度和状态，progress为ProcessModule发出的0-100整数百分比"""
+        # 暂存总体进度和状态文本，由_flush_progress统一刷新
+        self._pending_total = progress
+        if status is not None:
+            self._pending_status = status
+        self._progress_throttle.request()
+
+    @pyqtSlot(int, str)
+    def update_step_progress(self, progress, status=None):
+        """更新步骤进度，progress为ProcessModule发出的0-100整数百分比"""
+        # 暂存当前步骤进度和状态文本，由_flush_progress统一刷新
+        self._pending_step = progress
+        if status is not None:
+            self._pending_status = f"正在处理: {status}"
+        self._progress_throttle.request()
+
+    def _flush_progress(self):
+        """将暂存的进度写入进度条和状态文本"""
+        # 只写入发生变化的值
+        if self._pending_total is not None and self.total_progress_bar.value() != self._pending_total:
+            self.total_progress_bar.setValue(self._pending_total)
+        if self._pending_step is not None and self.step_progress_bar.value() != self._pending_step:
+            self.step_progress_bar.setValue(self._pending_step)
+        if self._pending_status is not None and self.status_label.text() != self._pending_status:
+            self.status_label.setText(self._pending_status)
+
+        self._discard_pending_progress()
+
+    def _discard_pending_progress(self):
+        """清空暂存的进度"""
+        self._pending_total = None
+        self._pending_step = None
+        self._pending_status = None
+
+    def check_cancelled_workers(self):
+        """
+        开始处理前检查上一个已取消的任务是否已经退出
+
+        返回:
+            bool: 可以开始新的处理任务时返回True，否则提示用户并返回False
+        """
+        if self.process_module.has_cancelled_workers():
+            QMessageBox.information(self, "请稍候", "上一个处理任务正在取消，请等待其结束后再开始")
+            return False
+        return True
+
+    def finish_cancel(self):
+        """
+        取消处理后更新按钮和状态，旧工作线程退出前保持开始按钮禁用
+        """
+        self.cancel_button.setEnabled(False)
+        if self.process_module.has_cancelled_workers():
+            self._waiting_cancelled_worker = True
+            self.status_label.setText("正在取消...")
+            self.start_button.setEnabled(False)
+        else:
+            self.status_label.setText("已取消")
+            self.start_button.setEnabled(True)
+
+    def _on_cancel_finished(self):
+        """已取消的工作线程全部退出后恢复开始按钮"""
+        if not self._waiting_cancelled_worker:
+            return
+        self._waiting_cancelled_worker = False
+        self.status_label.setText("已取消")
+        self.start_button.setEnabled(True)
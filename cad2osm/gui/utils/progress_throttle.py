@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+进度刷新节流
+
+工作线程的进度信号可能非常密集，逐条刷新界面会导致卡顿。此模块把短时间内的多次刷新请求合并，
+各标签页只需暂存最新的进度并提供自己的刷新回调。
+"""
+
+import time
+
+from PyQt5.QtCore import QTimer
+
+# 进度条刷新的最小间隔（秒），即每秒最多刷新约30次
+PROGRESS_UPDATE_INTERVAL = 1.0 / 30
+
+# 刷新请求被节流时，补一次刷新的延迟（毫秒），略长于最小刷新间隔，确保最后一次进度不会丢失
+FALLBACK_FLUSH_DELAY_MS = 40
+
+
+class ProgressThrottle:
+    """
+    合并密集的进度刷新请求，最多每PROGRESS_UPDATE_INTERVAL秒调用一次刷新回调
+    """
+
+    def __init__(self, flush_callback, parent=None):
+        """
+        参数:
+            flush_callback: 刷新回调，将暂存的进度写入界面
+            parent: 兜底定时器的父对象，通常为所属标签页，随其一起销毁
+        """
+        self._flush_callback = flush_callback
+        self._last_flush_ts = 0.0
+
+        self._fallback_timer = QTimer(parent)
+        self._fallback_timer.setSingleShot(True)
+        self._fallback_timer.setInterval(FALLBACK_FLUSH_DELAY_MS)
+        self._fallback_timer.timeout.connect(self.flush)
+
+    def request(self):
+        """请求刷新：距上次刷新足够久时立即刷新，否则由兜底定时器稍后刷新"""
+        if time.monotonic() - self._last_flush_ts > PROGRESS_UPDATE_INTERVAL:
+            self.flush()
+        elif not self._fallback_timer.isActive():
+            self._fallback_timer.start()
+
+    def flush(self):
+        """立即刷新，处理完成时调用，避免暂存的进度覆盖最终状态"""
+        self._fallback_timer.stop()
+        self._flush_callback()
+        self._last_flush_ts = time.monotonic()
@@ -7,10 +7,39 @@
 """
 
 import os
-import yaml
 import json
+import time
 from pathlib import Path
-from datetime import datetime
+from types import MappingProxyType
+from PyQt5.QtCore import QCoreApplication, QTimer
+
+# 配置修改后延迟写入的时间（毫秒），期间的多次修改合并为一次写入
+SAVE_CONFIG_DELAY_MS = 500
+
+# 项目时间戳格式
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# 带子目录的目录类型及其有效的子类型
+_VALID_SUB_TYPES = MappingProxyType({
+    'dxf': frozenset({'original', 'auto_filter', 'manual_filter'}),
+    'img': frozenset({'svg_auto_filter', 'svg_manual_filter', 'png_auto_filter', 'png_manual_filter'}),
+    'osm': frozenset({'original', 'texted', 'merged', 'corrected'})
+})
+
+def _import_yaml():
+    """
+    按需导入yaml，只在迁移旧版本的YAML配置时才付出导入开销
+    
+    返回:
+        (yaml模块, SafeLoader)，优先使用基于libyaml的C实现，不可用时回退到纯Python实现
+    """
+    import yaml
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+    return yaml, SafeLoader
+
 
 class ProjectManager:
     """
@@ -22,15 +51,18 @@ class ProjectManager:
         初始化项目管理器
         
         参数:
-            config_path: 配置文件路径，默认为应用程序目录下的config/app_config.yaml
+            config_path: 配置文件路径，默认为应用程序目录下的config/app_config.json
         """
         # 设置默认配置路径
         if config_path is None:
             # 获取应用程序目录
             app_dir = Path(__file__).parent.parent.parent
-            self.config_path = os.path.join(app_dir, 'gui', 'config', 'app_config.yaml')
-        else:
-            self.config_path = config_path
+            config_path = os.path.join(app_dir, 'gui', 'config', 'app_config.json')
+        
+        # 配置以JSON格式保存，旧版本使用的同名YAML配置在首次加载时迁移
+        base_path = os.path.splitext(config_path)[0]
+        self.config_path = base_path + '.json'
+        self._legacy_config_path = base_path + '.yaml'
         
         # 确保配置目录存在
         os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
@@ -41,6 +73,18 @@ class ProjectManager:
         # 当前活动项目
         self.current_project = None
         
+        # 延迟写入配置的状态
+        self._config_dirty = False
+        self._save_scheduled = False
+        # 自上次写入后修改过的项目，写入时统一更新最后修改时间
+        self._modified_projects = set()
+        
+        # 各项目的数据目录，键为项目名称
+        self._project_paths = {}
+        
+        # 已解析的目录路径缓存，键为(项目名称, 目录类型, 子类型)
+        self._dir_cache = {}
+        
         # 加载配置
         self.load_config()
     
@@ -48,35 +92,87 @@ class ProjectManager:
         """
         加载应用程序配置
         """
-        if os.path.exists(self.config_path):
-            try:
+        self._dir_cache.clear()
+        
+        config = None
+        migrated = False
+        try:
+            if os.path.exists(self.config_path):
                 with open(self.config_path, 'r', encoding='utf-8') as f:
-                    config = yaml.safe_load(f)
-                    if config and 'projects' in config:
-                        self.projects = config['projects']
-                    if config and 'current_project' in config:
-                        self.current_project = config['current_project']
-            except Exception as e:
-                print(f"加载配置文件失败: {e}")
-                # 使用默认配置
-                self.projects = {}
-                self.current_project = None
-        else:
-            # 配置文件不存在，使用默认配置
-            self.projects = {}
-            self.current_project = None
+                    config = json.load(f)
+            elif os.path.exists(self._legacy_config_path):
+                # 只有旧版本的YAML配置时读取一次，随后转存为JSON
+                yaml, SafeLoader = _import_yaml()
+                with open(self._legacy_config_path, 'r', encoding='utf-8') as f:
+                    config = yaml.load(f, Loader=SafeLoader)
+                migrated = True
+        except Exception as e:
+            print(f"加载配置文件失败: {e}")
+            # 使用默认配置
+            config = None
+            migrated = False
+        
+        self.projects = (config or {}).get('projects') or {}
+        self.current_project = (config or {}).get('current_project')
+        
+        self._project_paths = {
+            name: Path(meta['path']) / 'data' / name
+            for name, meta in self.projects.items()
+            if isinstance(meta, dict) and 'path' in meta
+        }
+        
+        # JSON配置写入成功后才删除旧的YAML配置
+        if migrated:
+            self._config_dirty = True
+            if self.flush_config():
+                try:
+                    os.remove(self._legacy_config_path)
+                except OSError as e:
+                    print(f"删除旧配置文件失败: {e}")
     
     def save_config(self):
         """
         保存应用程序配置
+        
+        配置先标记为待写入，短时间内的多次修改合并为一次写入；
+        没有Qt应用程序实例（无事件循环）时立即写入。
         """
+        self._config_dirty = True
+        if QCoreApplication.instance() is None:
+            return self.flush_config()
+        
+        if not self._save_scheduled:
+            self._save_scheduled = True
+            QTimer.singleShot(SAVE_CONFIG_DELAY_MS, self.flush_config)
+        return True
+    
+    def flush_config(self):
+        """
+        立即写入待保存的应用程序配置
+        """
+        self._save_scheduled = False
+        if not self._config_dirty:
+            return True
+        
+        # 每次写入只格式化一次时间
+        if self._modified_projects:
+            now = time.strftime(TIMESTAMP_FORMAT)
+            for project_name in self._modified_projects:
+                if project_name in self.projects:
+                    self.projects[project_name]['last_modified'] = now
+            self._modified_projects.clear()
+        
         try:
             config = {
                 'projects': self.projects,
                 'current_project': self.current_project
             }
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                yaml.dump(config, f, default_flow_style=False)
+            # 先写入临时文件再替换，写入中断时不会损坏原有配置
+            temp_path = self.config_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(config, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_path, self.config_path)
+            self._config_dirty = False
             return True
         except Exception as e:
             print(f"保存配置文件失败: {e}")
@@ -97,54 +193,45 @@ class ProjectManager:
             print(f"项目 {project_name} 已存在")
             return False
         
+        # 项目路径发生变化，清除已缓存的目录路径
+        self._dir_cache.clear()
+        
         # 创建项目目录结构
-        project_dir = os.path.join(project_root, 'data', project_name)
-        
-        # 定义标准目录结构
-        dirs = {
-            'dwg': os.path.join(project_dir, 'dwg'),
-            'dxf': {
-                'original': os.path.join(project_dir, 'dxf', 'original'),
-                'auto_filter': os.path.join(project_dir, 'dxf', 'auto_filter'),
-                'manual_filter': os.path.join(project_dir, 'dxf', 'manual_filter')
-            },
-            'img': {
-                'svg_auto_filter': os.path.join(project_dir, 'img', 'svg_auto_filter'),
-                'svg_manual_filter': os.path.join(project_dir, 'img', 'svg_manual_filter'),
-                'png_auto_filter': os.path.join(project_dir, 'img', 'png_auto_filter'),
-                'png_manual_filter': os.path.join(project_dir, 'img', 'png_manual_filter')
-            },
-            'osm': {
-                'original': os.path.join(project_dir, 'osm', 'original'),
-                'texted': os.path.join(project_dir, 'osm', 'texted'),
-                'merged': os.path.join(project_dir, 'osm', 'merged'),
-                'corrected': os.path.join(project_dir, 'osm', 'corrected')
-            },
-            'bounds': os.path.join(project_dir, 'bounds')
-        }
+        project_dir = Path(project_root) / 'data' / project_name
+        
+        # 定义标准目录结构（只列出叶子目录，父目录由mkdir一并创建）
+        dirs = [
+            project_dir / 'bounds',
+            project_dir / 'dwg',
+            project_dir / 'dxf' / 'auto_filter',
+            project_dir / 'dxf' / 'manual_filter',
+            project_dir / 'dxf' / 'original',
+            project_dir / 'img' / 'png_auto_filter',
+            project_dir / 'img' / 'png_manual_filter',
+            project_dir / 'img' / 'svg_auto_filter',
+            project_dir / 'img' / 'svg_manual_filter',
+            project_dir / 'osm' / 'corrected',
+            project_dir / 'osm' / 'merged',
+            project_dir / 'osm' / 'original',
+            project_dir / 'osm' / 'texted'
+        ]
         
         try:
             # 创建目录结构
-            for _, path in dirs['dxf'].items():
-                os.makedirs(path, exist_ok=True)
-            
-            for _, path in dirs['img'].items():
-                os.makedirs(path, exist_ok=True)
-            
-            for _, path in dirs['osm'].items():
-                os.makedirs(path, exist_ok=True)
-            
-            os.makedirs(dirs['dwg'], exist_ok=True)
-            os.makedirs(dirs['bounds'], exist_ok=True)
+            for path in dirs:
+                path.mkdir(parents=True, exist_ok=True)
             
             # 添加项目到配置
+            now = time.strftime(TIMESTAMP_FORMAT)
             self.projects[project_name] = {
                 'path': project_root,
-                'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'last_modified': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'created_at': now,
+                'last_modified': now,
                 'status': {}
             }
             
+            self._project_paths[project_name] = project_dir
+            
             # 设置为当前项目
             self.current_project = project_name
             
@@ -173,8 +260,8 @@ class ProjectManager:
         # 设置为当前项目
         self.current_project = project_name
         
-        # 更新最后修改时间
-        self.projects[project_name]['last_modified'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # 最后修改时间在写入配置时更新
+        self._modified_projects.add(project_name)
         
         # 保存配置
         self.save_config()
@@ -194,10 +281,11 @@ class ProjectManager:
         if project_name is None:
             project_name = self.current_project
         
-        if project_name not in self.projects:
+        project_path = self._project_paths.get(project_name)
+        if project_path is None:
             return None
         
-        return os.path.join(self.projects[project_name]['path'], 'data', project_name)
+        return os.fspath(project_path)
     
     def get_directory_path(self, dir_type, sub_type=None, project_name=None):
         """
@@ -211,32 +299,41 @@ class ProjectManager:
         返回:
             目录路径，如果项目或目录类型不存在则返回None
         """
-        project_path = self.get_project_path(project_name)
-        if not project_path:
+        if project_name is None:
+            project_name = self.current_project
+        
+        key = (project_name, dir_type, sub_type)
+        path = self._dir_cache.get(key)
+        if path is None:
+            path = self._resolve_directory_path(dir_type, sub_type, project_name)
+            if path is not None:
+                self._dir_cache[key] = path
+        return path
+    
+    def _resolve_directory_path(self, dir_type, sub_type, project_name):
+        """
+        根据项目路径拼接目录路径，结果由get_directory_path缓存
+        """
+        project_path = self._project_paths.get(project_name)
+        if project_path is None:
             return None
         
         if dir_type not in ['dwg', 'dxf', 'img', 'osm', 'bounds']:
             return None
         
         if dir_type == 'dwg':
-            return os.path.join(project_path, 'dwg')
+            return os.fspath(project_path / 'dwg')
         elif dir_type == 'bounds':
-            return os.path.join(project_path, 'bounds')
+            return os.fspath(project_path / 'bounds')
         elif dir_type in ['dxf', 'img', 'osm']:
             if sub_type is None:
-                return os.path.join(project_path, dir_type)
+                return os.fspath(project_path / dir_type)
             
             # 验证子类型
-            valid_sub_types = {
-                'dxf': ['original', 'auto_filter', 'manual_filter'],
-                'img': ['svg_auto_filter', 'svg_manual_filter', 'png_auto_filter', 'png_manual_filter'],
-                'osm': ['original', 'texted', 'merged', 'corrected']
-            }
-            
-            if sub_type not in valid_sub_types[dir_type]:
+            if sub_type not in _VALID_SUB_TYPES[dir_type]:
                 return None
             
-            return os.path.join(project_path, dir_type, sub_type)
+            return os.fspath(project_path / dir_type / sub_type)
         
         return None
     
@@ -263,7 +360,7 @@ class ProjectManager:
             self.projects[project_name]['status'] = {}
         
         self.projects[project_name]['status'][status_key] = status_value
-        self.projects[project_name]['last_modified'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self._modified_projects.add(project_name)
         
         # 保存配置
         self.save_config()
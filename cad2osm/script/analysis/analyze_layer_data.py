@@ -1,11 +1,15 @@
 import os
 import re
 from collections import Counter
+from itertools import chain
 
 # 定义数据目录路径
 ORIGINAL_DIR = '../data/SIST-layer-info-original'
 FILTERED_DIR = '../data/SIST-layer-info-filtered'
 
+# 图层名称分词使用的分隔符 '-', '_', '$', ' '
+TOKEN_SEPARATOR_RE = re.compile(r'[-_$ ]+')
+
 # 获取文件对
 def get_file_pairs(original_dir, filtered_dir):
     pairs = {}
@@ -46,7 +50,7 @@ def read_layers_from_file(filepath):
 # 分词函数
 def tokenize_layer_name(layer_name):
     # 使用 '-', '_', '$', ' ' 作为分隔符，并将结果转为大写
-    tokens = re.split(r'[-_$ ]+', layer_name)
+    tokens = TOKEN_SEPARATOR_RE.split(layer_name)
     return [token.upper() for token in tokens if token] # 过滤空字符串
 
 # 主分析逻辑
@@ -81,13 +85,8 @@ def analyze_layers():
     print(f"所有样本中唯一舍弃的图层总数: {len(all_discarded_layers)}")
 
     # Token频率分析
-    kept_tokens = Counter()
-    for layer in all_kept_layers:
-        kept_tokens.update(tokenize_layer_name(layer))
-
-    discarded_tokens = Counter()
-    for layer in all_discarded_layers:
-        discarded_tokens.update(tokenize_layer_name(layer))
+    kept_tokens = Counter(chain.from_iterable(map(tokenize_layer_name, all_kept_layers)))
+    discarded_tokens = Counter(chain.from_iterable(map(tokenize_layer_name, all_discarded_layers)))
 
     print("\n--- Token 频率分析 (Top 30) ---")
     print("\n在 '保留' 图层中最常见的 Tokens:")
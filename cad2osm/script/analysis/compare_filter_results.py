@@ -8,6 +8,8 @@ FLOORS = ['F1', 'F2', 'F3', 'F4', 'F5']
 MANUAL_FILE_PREFIX = 'layer-info-filtered-sist-'
 SCRIPT_FILE_PREFIX = 'layer-info-filtered-SIST-'
 FILE_EXT = '.txt'
+# 图层列表中的分隔行，如 'A---'
+is_separator_line = re.compile(r'[A-Z]-{3,}').fullmatch
 
 # --- 函数 ---
 def read_layers_from_file(filepath):
@@ -20,7 +22,7 @@ def read_layers_from_file(filepath):
             for line in f:
                 layer_name = line.strip()
                 # 忽略空行和特定分隔符
-                if layer_name and not re.match(r'^[A-Z]---+$', layer_name):
+                if layer_name and not is_separator_line(layer_name):
                     layers.add(layer_name)
     except FileNotFoundError:
         print(f"警告：文件未找到 {filepath}")
@@ -15,7 +15,6 @@
 """
 
 import argparse
-import xml.etree.ElementTree as ET
 import numpy as np
 import json
 import os
@@ -26,6 +25,12 @@ import statistics
 from collections import defaultdict
 import random
 
+# 优先使用基于C实现的lxml解析和序列化XML，未安装时回退到标准库
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+
 
 def load_yaml_config(file_path):
     """加载YAML配置文件"""
@@ -47,10 +52,17 @@ def load_osm_file(file_path):
         return None, None
 
 
+# 写出合并结果时使用的缓冲区大小
+WRITE_BUFFER_SIZE = 1 << 20
+
+
 def save_osm_file(tree, file_path):
-    """保存OSM XML文件"""
+    """保存OSM XML文件（大缓冲区顺序写入，结束时只fsync一次）"""
     try:
-        tree.write(file_path, encoding='utf-8', xml_declaration=True)
+        with open(file_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            tree.write(f, encoding='utf-8', xml_declaration=True)
+            f.flush()
+            os.fsync(f.fileno())
         print(f"Successfully saved to: {file_path}")
         return True
     except Exception as e:
@@ -74,21 +86,76 @@ def find_root_node(osm_root):
                 return node
     return None
 
-def find_matching_areas(osm_root, area_type):
+def build_node_index(osm_root, node_ids=None):
     """
-    查找特定类型的区域（电梯或楼梯）
+    构建节点坐标索引，以结构数组（SoA）形式存储
     
     参数：
         osm_root: OSM XML根元素
-        area_type: 区域类型，'elevator'或'stairs'
+        node_ids: 可选，只收录这些ID（字符串集合）的节点，默认收录全部节点
         
     返回：
-        字典，键为区域名称，值为包含区域信息的字典列表
+        (ids, coords): ids为按升序排列的节点ID数组（int64[N]），
+        coords为对应的坐标数组（float64[N, 2]，每行为(lat, lon)）
     """
-    areas = defaultdict(list)
+    id_list = []
+    coord_list = []
+    for node in osm_root.iter('node'):
+        node_id = node.get('id')
+        if node_ids is not None and node_id not in node_ids:
+            continue
+        id_list.append(int(node_id))
+        coord_list.append((float(node.get('lat')), float(node.get('lon'))))
     
-    # 查找所有way元素
-    for way in osm_root.findall('.//way'):
+    ids = np.fromiter(id_list, np.int64, count=len(id_list))
+    coords = np.array(coord_list, np.float64).reshape(-1, 2)
+    
+    # 按ID排序，便于使用二分查找
+    order = ids.argsort(kind='stable')
+    return ids[order], coords[order]
+
+
+def lookup_node_coords(node_index, refs):
+    """
+    通过二分查找获取节点引用对应的坐标
+    
+    参数：
+        node_index: build_node_index返回的(ids, coords)
+        refs: 节点ID字符串列表
+        
+    返回：
+        坐标数组（float64[K, 2]），找不到的引用会被跳过
+    """
+    ids, coords = node_index
+    ref_ids = np.fromiter((int(ref) for ref in refs), np.int64, count=len(refs))
+    if len(ids) == 0 or len(ref_ids) == 0:
+        return np.empty((0, 2), np.float64)
+    
+    idx = np.searchsorted(ids, ref_ids)
+    idx = np.minimum(idx, len(ids) - 1)
+    found = ids[idx] == ref_ids
+    return coords[idx[found]]
+
+
+def find_areas_by_type(osm_root, area_types=('elevator', 'stairs'), node_index=None):
+    """
+    单次遍历查找多种类型的区域（电梯、楼梯等）
+    
+    先遍历way收集目标区域及其节点引用，再只为这些引用构建节点坐标索引，
+    避免为每种区域类型重复扫描整个文件。
+    
+    参数：
+        osm_root: OSM XML根元素
+        area_types: 区域类型元组，如('elevator', 'stairs')
+        node_index: 可选，build_node_index返回的节点坐标索引，未提供时只为目标区域的节点构建
+        
+    返回：
+        字典，键为区域类型，值为find_matching_areas格式的区域字典
+    """
+    # 第一遍：遍历way，收集目标区域及所需的节点引用
+    candidates = []
+    needed_refs = set()
+    for way in osm_root.iter('way'):
         area_type_tag = None
         name_tag = None
         level_tag = None
@@ -98,7 +165,7 @@ def find_matching_areas(osm_root, area_type):
             k = tag.get('k')
             v = tag.get('v')
             
-            if k == 'osmAG:areaType' and v == area_type:
+            if k == 'osmAG:areaType' and v in area_types:
                 area_type_tag = v
             elif k == 'name':
                 name_tag = v
@@ -108,30 +175,47 @@ def find_matching_areas(osm_root, area_type):
         # 如果找到了所需的所有标签
         if area_type_tag and name_tag and level_tag:
             # 收集节点引用
-            nodes = []
-            for nd in way.findall('./nd'):
-                ref = nd.get('ref')
-                nodes.append(ref)
-            
-            # 收集节点坐标
-            coordinates = []
-            for ref in nodes:
-                node = osm_root.find(f".//node[@id='{ref}']")
-                if node is not None:
-                    lat = float(node.get('lat'))
-                    lon = float(node.get('lon'))
-                    coordinates.append((lat, lon))
-            
-            # 添加到区域字典
-            areas[name_tag].append({
-                'id': way.get('id'),
-                'level': level_tag,
-                'nodes': nodes,
-                'coordinates': coordinates,
-                'way_element': way
-            })
+            nodes = [nd.get('ref') for nd in way.findall('./nd')]
+            needed_refs.update(nodes)
+            candidates.append((area_type_tag, name_tag, level_tag, nodes, way))
+    
+    # 只为需要的节点构建坐标索引
+    if node_index is None:
+        node_index = build_node_index(osm_root, needed_refs)
+    
+    # 第二遍：解析坐标并计算质心
+    areas_by_type = {area_type: defaultdict(list) for area_type in area_types}
+    for area_type_tag, name_tag, level_tag, nodes, way in candidates:
+        # 收集节点坐标
+        coordinates = lookup_node_coords(node_index, nodes)
+        
+        # 添加到区域字典，预先计算质心供偏移量计算复用
+        areas_by_type[area_type_tag][name_tag].append({
+            'id': way.get('id'),
+            'level': level_tag,
+            'nodes': nodes,
+            'coordinates': coordinates,
+            'centroid': calculate_centroid(coordinates),
+            'way_element': way
+        })
+    
+    return areas_by_type
+
+
+def find_matching_areas(osm_root, area_type, node_index=None):
+    """
+    查找特定类型的区域（电梯或楼梯）
     
-    return areas
+    参数：
+        osm_root: OSM XML根元素
+        area_type: 区域类型，'elevator'或'stairs'
+        node_index: 可选，build_node_index返回的节点坐标索引，未提供时自动构建
+        
+    返回：
+        字典，键为区域名称，值为包含区域信息的字典列表，
+        其中'centroid'为质心(lat, lon)
+    """
+    return find_areas_by_type(osm_root, (area_type,), node_index)[area_type]
 
 
 def get_tag_value(element, tag_key):
@@ -184,33 +268,33 @@ def calculate_centroid(coordinates):
     计算多边形的质心，使用更精确的方法
     
     参数：
-        coordinates: 多边形顶点坐标列表 [(lat, lon), ...]
+        coordinates: 多边形顶点坐标，列表 [(lat, lon), ...] 或 float64[N, 2] 数组
         
     返回：
         质心坐标 (lat, lon)
     """
-    if not coordinates:
+    if len(coordinates) == 0:
         return None
     
     # 对于经纬度坐标，简单的算术平均可能更稳定
     # 特别是对于小区域（如单个房间）
-    n = len(coordinates)
-    lat_sum = sum(lat for lat, _ in coordinates)
-    lon_sum = sum(lon for _, lon in coordinates)
+    lat_mean, lon_mean = np.asarray(coordinates, np.float64).mean(axis=0)
     
-    return (lat_sum / n, lon_sum / n)
+    return (float(lat_mean), float(lon_mean))
 
 
-def calculate_offset(ref_areas, target_areas):
+def calculate_offset(ref_areas, target_areas, return_details=False):
     """
     计算参照图和待校正图之间的相对位置偏差，使用更精确的方法
     
     参数：
         ref_areas: 参照图中的区域字典
         target_areas: 待校正图中的区域字典
+        return_details: 是否同时返回每对匹配区域的偏移详情
         
     返回：
         (lat_offset, lon_offset): 纬度和经度的偏移量
+        return_details为True时返回 (lat_offset, lon_offset, offset_details)
     """
     offsets = []
     offset_details = []  # 用于调试
@@ -226,35 +310,32 @@ def calculate_offset(ref_areas, target_areas):
                     # 确保不是同一层
                     if ref_area['level'] != target_area['level']:
                         # 计算每个顶点的偏移量，而不仅仅是质心
-                        vertex_offsets = []
-                        
+                        # 偏移量是经纬度之差，必须保持float64精度
+                        ref_coords = np.asarray(ref_area['coordinates'], dtype=np.float64)
+                        target_coords = np.asarray(target_area['coordinates'], dtype=np.float64)
+
                         # 如果顶点数量相同，直接计算对应顶点的偏移量
-                        if len(ref_area['coordinates']) == len(target_area['coordinates']):
-                            for i in range(len(ref_area['coordinates'])):
-                                ref_lat, ref_lon = ref_area['coordinates'][i]
-                                target_lat, target_lon = target_area['coordinates'][i]
-                                lat_offset = ref_lat - target_lat
-                                lon_offset = ref_lon - target_lon
-                                vertex_offsets.append((lat_offset, lon_offset))
+                        if len(ref_coords) == len(target_coords):
+                            vertex_offsets = (ref_coords - target_coords).reshape(-1, 2)
                         else:
                             # 如果顶点数量不同，使用质心
-                            ref_centroid = calculate_centroid(ref_area['coordinates'])
-                            target_centroid = calculate_centroid(target_area['coordinates'])
-                            
+                            ref_centroid = ref_area['centroid']
+                            target_centroid = target_area['centroid']
+
                             if ref_centroid and target_centroid:
-                                lat_offset = ref_centroid[0] - target_centroid[0]
-                                lon_offset = ref_centroid[1] - target_centroid[1]
-                                vertex_offsets.append((lat_offset, lon_offset))
-                        
-                        if vertex_offsets:
+                                vertex_offsets = (np.asarray(ref_centroid, dtype=np.float64)
+                                                  - np.asarray(target_centroid, dtype=np.float64)).reshape(1, 2)
+                            else:
+                                vertex_offsets = np.empty((0, 2))
+
+                        if len(vertex_offsets):
                             # 计算这对区域的平均偏移量
-                            avg_lat_offset = sum(offset[0] for offset in vertex_offsets) / len(vertex_offsets)
-                            avg_lon_offset = sum(offset[1] for offset in vertex_offsets) / len(vertex_offsets)
+                            avg_lat_offset, avg_lon_offset = (float(v) for v in vertex_offsets.mean(axis=0))
                             offsets.append((avg_lat_offset, avg_lon_offset))
                             
                             # 保存详细信息用于调试
-                            ref_centroid = calculate_centroid(ref_area['coordinates'])
-                            target_centroid = calculate_centroid(target_area['coordinates'])
+                            ref_centroid = ref_area['centroid']
+                            target_centroid = target_area['centroid']
                             offset_details.append({
                                 'name': name,
                                 'ref_level': ref_area['level'],
@@ -268,6 +349,8 @@ def calculate_offset(ref_areas, target_areas):
     
     if not offsets:
         print("警告：没有找到匹配的区域来计算偏移量")
+        if return_details:
+            return 0, 0, offset_details
         return 0, 0
     
     # 打印详细的偏移信息用于调试
@@ -351,6 +434,8 @@ def calculate_offset(ref_areas, target_areas):
     print(f"\n计算得到的最终加权偏移量：纬度 {final_lat_offset:.10f}, 经度 {final_lon_offset:.10f}")
     print(f"共找到 {len(offsets)} 对匹配区域，涉及 {len(grouped_offsets)} 个不同名称的区域")
     
+    if return_details:
+        return final_lat_offset, final_lon_offset, offset_details
     return final_lat_offset, final_lon_offset
 
 
@@ -753,8 +838,9 @@ def main():
         ensure_version_attribute(relation)
     
     # 查找参照图中的电梯和楼梯区域
-    ref_elevators = find_matching_areas(ref_root, 'elevator')
-    ref_stairs = find_matching_areas(ref_root, 'stairs')
+    ref_areas_by_type = find_areas_by_type(ref_root, ('elevator', 'stairs'))
+    ref_elevators = ref_areas_by_type['elevator']
+    ref_stairs = ref_areas_by_type['stairs']
     
     # 合并参照区域字典
     ref_areas = defaultdict(list)
@@ -786,8 +872,9 @@ def main():
             print("警告：待校正图中没有找到root节点")
         
         # 查找待校正图中的电梯和楼梯区域
-        target_elevators = find_matching_areas(target_root, 'elevator')
-        target_stairs = find_matching_areas(target_root, 'stairs')
+        target_areas_by_type = find_areas_by_type(target_root, ('elevator', 'stairs'))
+        target_elevators = target_areas_by_type['elevator']
+        target_stairs = target_areas_by_type['stairs']
         
         # 合并待校正区域字典
         target_areas = defaultdict(list)